@@ -61,6 +61,13 @@ setup(
             "msal>=1.20.0",
             "requests>=2.28.0",
         ],
+        "performance": [
+            "numba>=0.57.0",
+            "orjson>=3.9.0",
+            "pyarrow>=14.0.0",
+            "faiss-cpu>=1.7.4",
+            "sentence-transformers[onnx]>=3.2.0",
+        ],
     },
     entry_points={
         "console_scripts": [
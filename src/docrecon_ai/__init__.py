@@ -9,11 +9,20 @@ __version__ = "1.0.0"
 __author__ = "Manus AI"
 __email__ = "info@manus.ai"
 
-# Core imports
+import importlib
+
+# Core imports (analysis and reporting are loaded on first access, PEP 562)
 from .crawler import DocumentCrawler
-from .nlp import NLPAnalyzer, TextExtractor
-from .detection import DuplicateDetector, SimilarityAnalyzer
-from .reporting import HTMLReporter, CSVReporter, JSONReporter
+
+_LAZY_IMPORTS = {
+    "NLPAnalyzer": ".nlp",
+    "TextExtractor": ".nlp",
+    "DuplicateDetector": ".detection",
+    "SimilarityAnalyzer": ".detection",
+    "HTMLReporter": ".reporting",
+    "CSVReporter": ".reporting",
+    "JSONReporter": ".reporting",
+}
 
 # Configuration
 from .config import Config, load_config
@@ -39,3 +48,14 @@ __all__ = [
     "__email__",
 ]
 
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
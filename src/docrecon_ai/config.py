@@ -28,6 +28,7 @@ class CrawlerConfig:
         '~$*', '.tmp', 'Thumbs.db', '.DS_Store', '*.lnk', '*.url'
     ])
     max_depth: int = 10
+    max_files: Optional[int] = None  # Stop crawling after this many files
     follow_symlinks: bool = False
     threads: int = 4
 
@@ -43,6 +44,10 @@ class NLPConfig:
     enable_entities: bool = True
     enable_keywords: bool = True
     enable_clustering: bool = True
+    index_precision: str = "float32"  # float16 halves similarity index memory
+    extraction_workers: Optional[int] = None  # Text extraction processes, None = one per CPU
+    entity_workers: int = 8  # Threads for entity and keyword extraction
+    embedding_backend: str = "torch"  # torch, onnx or openvino (sentence-transformers >= 3.2)
 
 
 @dataclass
@@ -245,6 +250,7 @@ def save_config(config: Config, config_path: str) -> None:
             'supported_extensions': config.crawler.supported_extensions,
             'ignore_patterns': config.crawler.ignore_patterns,
             'max_depth': config.crawler.max_depth,
+            'max_files': config.crawler.max_files,
             'follow_symlinks': config.crawler.follow_symlinks,
             'threads': config.crawler.threads,
         },
@@ -257,6 +263,10 @@ def save_config(config: Config, config_path: str) -> None:
             'enable_entities': config.nlp.enable_entities,
             'enable_keywords': config.nlp.enable_keywords,
             'enable_clustering': config.nlp.enable_clustering,
+            'index_precision': config.nlp.index_precision,
+            'extraction_workers': config.nlp.extraction_workers,
+            'entity_workers': config.nlp.entity_workers,
+            'embedding_backend': config.nlp.embedding_backend,
         },
         'duplicates': {
             'hash_algorithm': config.duplicates.hash_algorithm,
@@ -11,19 +11,21 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Iterator, Union
+from typing import List, Optional, Dict, Any, Iterator, Tuple, Union
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentInfo:
     """
     Information about a discovered document.
     
     This class holds all metadata and content information
     extracted from a document during the crawling process.
+    Instances use __slots__, so there is no per-document __dict__.
     """
     # Basic file information
     path: str
@@ -100,6 +102,31 @@ class DocumentInfo:
         """Check if file is a PDF"""
         return self.file_extension == '.pdf' or self.mime_type == 'application/pdf'
     
+    def to_tuple(self) -> Tuple[Any, ...]:
+        """Values in to_dict() order (dates and metadata unconverted), for columnar export"""
+        return (
+            self.path,
+            self.filename,
+            self.size,
+            self.size_mb,
+            self.modified_date,
+            self.created_date,
+            self.file_extension,
+            self.mime_type,
+            self.encoding,
+            self.sha256_hash,
+            self.md5_hash,
+            self.text_length,
+            self.metadata,
+            self.source_type,
+            self.source_url,
+            self.processed,
+            self.error_message,
+            self.is_text_file,
+            self.is_office_document,
+            self.is_pdf,
+        )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
@@ -142,12 +169,20 @@ class BaseCrawler(ABC):
         """
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.hash_chunk_size = 1024 * 1024  # Bytes per read when hashing files
+        self.max_files = getattr(config.crawler, 'max_files', None) if config else None
+        self.supported_extensions = (
+            frozenset(ext.lower() for ext in getattr(config.crawler, 'supported_extensions', None) or ())
+            if config else frozenset()
+        )
         
-        # Statistics
+        # Statistics, updated through _increment_stat so that several paths
+        # can be crawled concurrently by one crawler instance
         self.files_found = 0
         self.files_processed = 0
         self.files_skipped = 0
         self.errors = 0
+        self._stats_lock = threading.Lock()
         
     @abstractmethod
     def scan(self, source: str, **kwargs) -> Iterator[DocumentInfo]:
@@ -163,6 +198,42 @@ class BaseCrawler(ABC):
         """
         pass
     
+    def crawl_path(self, path: Optional[str]) -> List[DocumentInfo]:
+        """
+        Crawl a single source path.
+        
+        Safe to call from several threads at once; statistics and the
+        max_files limit are shared by all calls.
+        
+        Args:
+            path: Source path/URL to crawl
+            
+        Returns:
+            List of discovered documents
+        """
+        return list(self.scan(path))
+    
+    def _increment_stat(self, name: str, amount: int = 1):
+        """Thread-safely add amount to the statistics counter name"""
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + amount)
+    
+    def _claim_file_slot(self) -> bool:
+        """
+        Count one more processed file, unless max_files has been reached.
+        
+        The check and the increment happen under one lock, so concurrent
+        crawls never process more than max_files files in total.
+        
+        Returns:
+            bool: True if the file may be processed
+        """
+        with self._stats_lock:
+            if self.max_files and self.files_processed >= self.max_files:
+                return False
+            self.files_processed += 1
+            return True
+    
     def should_process_file(self, filepath: str, size: int) -> bool:
         """
         Check if a file should be processed based on configuration.
@@ -174,19 +245,45 @@ class BaseCrawler(ABC):
         Returns:
             bool: True if file should be processed
         """
+        return self.should_process_size(size) and self.should_process_filename(filepath)
+    
+    def should_process_size(self, size: int) -> bool:
+        """
+        Check the file size limit.
+        
+        For crawlers that already applied should_process_filename before
+        stat'ing the file.
+        
+        Args:
+            size: File size in bytes
+            
+        Returns:
+            bool: True if file is within the size limit
+        """
         if not self.config:
             return True
+        
+        return not (hasattr(self.config.crawler, 'max_file_size') and
+                    size > self.config.crawler.max_file_size)
+    
+    def should_process_filename(self, filepath: str) -> bool:
+        """
+        Check extension and ignore patterns, which only need the file name.
+        
+        Crawlers can call this before stat'ing or opening a file.
+        
+        Args:
+            filepath: Path to the file
             
+        Returns:
+            bool: True if file passes the name-based filters
+        """
+        if not self.config:
+            return True
+        
         # Check file extension
         file_ext = Path(filepath).suffix.lower()
-        if (hasattr(self.config.crawler, 'supported_extensions') and 
-            self.config.crawler.supported_extensions and
-            file_ext not in self.config.crawler.supported_extensions):
-            return False
-        
-        # Check file size
-        if (hasattr(self.config.crawler, 'max_file_size') and
-            size > self.config.crawler.max_file_size):
+        if self.supported_extensions and file_ext not in self.supported_extensions:
             return False
         
         # Check ignore patterns
@@ -214,19 +311,39 @@ class BaseCrawler(ABC):
         Returns:
             str: Hex digest of the hash, or None if error
         """
+        return self.calculate_file_hashes(filepath, [algorithm])[algorithm]
+    
+    def calculate_file_hashes(self, filepath: str, algorithms: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Calculate several hashes of a file in a single read pass.
+        
+        Args:
+            filepath: Path to the file
+            algorithms: Hash algorithms (sha256, md5)
+            
+        Returns:
+            dict: Hex digest per algorithm (None for all if error)
+        """
         try:
-            hash_obj = hashlib.new(algorithm)
+            hash_objs = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
             
-            with open(filepath, 'rb') as f:
-                # Read file in chunks to handle large files
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hash_obj.update(chunk)
+            # Read large chunks into one reusable buffer; hashlib releases the
+            # GIL on big updates, so crawler threads overlap reads and hashing
+            buffer = bytearray(self.hash_chunk_size)
+            view = memoryview(buffer)
+            with open(filepath, 'rb', buffering=0) as f:
+                while True:
+                    bytes_read = f.readinto(buffer)
+                    if not bytes_read:
+                        break
+                    for hash_obj in hash_objs.values():
+                        hash_obj.update(view[:bytes_read])
             
-            return hash_obj.hexdigest()
+            return {algorithm: hash_obj.hexdigest() for algorithm, hash_obj in hash_objs.items()}
             
         except Exception as e:
-            self.logger.error(f"Error calculating {algorithm} hash for {filepath}: {e}")
-            return None
+            self.logger.error(f"Error calculating {', '.join(algorithms)} hash for {filepath}: {e}")
+            return {algorithm: None for algorithm in algorithms}
     
     def get_file_metadata(self, filepath: str) -> Dict[str, Any]:
         """
@@ -271,8 +388,9 @@ class BaseCrawler(ABC):
     
     def reset_statistics(self):
         """Reset crawler statistics"""
-        self.files_found = 0
-        self.files_processed = 0
-        self.files_skipped = 0
-        self.errors = 0
+        with self._stats_lock:
+            self.files_found = 0
+            self.files_processed = 0
+            self.files_skipped = 0
+            self.errors = 0
 
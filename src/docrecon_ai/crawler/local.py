@@ -10,6 +10,7 @@ import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Iterator, Optional, List
+from itertools import islice
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
@@ -54,12 +55,16 @@ class LocalCrawler(BaseCrawler):
         
         if not source_path.exists():
             self.logger.error(f"Source path does not exist: {source}")
-            self.errors += 1
+            self._increment_stat('errors')
             return
         
         if not source_path.is_dir():
             # Single file
-            if source_path.is_file():
+            if source_path.is_file() and not self._max_files_reached():
+                self._increment_stat('files_found')
+                if not self.should_process_filename(str(source_path)):
+                    self._increment_stat('files_skipped')
+                    return
                 doc_info = self._process_file(source_path)
                 if doc_info:
                     yield doc_info
@@ -94,17 +99,24 @@ class LocalCrawler(BaseCrawler):
             entries = list(directory.iterdir())
         except PermissionError:
             self.logger.warning(f"Permission denied: {directory}")
-            self.errors += 1
+            self._increment_stat('errors')
             return
         except Exception as e:
             self.logger.error(f"Error reading directory {directory}: {e}")
-            self.errors += 1
+            self._increment_stat('errors')
             return
         
         # Process files first
         for entry in entries:
+            if self._max_files_reached():
+                return
+            
             if entry.is_file():
-                self.files_found += 1
+                self._increment_stat('files_found')
+                # Name-based filters first, so rejected files are never stat'ed or read
+                if not self.should_process_filename(str(entry)):
+                    self._increment_stat('files_skipped')
+                    continue
                 doc_info = self._process_file(entry)
                 if doc_info:
                     yield doc_info
@@ -129,8 +141,43 @@ class LocalCrawler(BaseCrawler):
         Yields:
             DocumentInfo: Information about each discovered document
         """
-        # Collect all files first
-        all_files = []
+        candidates = self._walk_candidate_files(directory, recursive)
+        
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            # Without a file limit all files are processed in one batch. With
+            # one, each batch is at most the number of files still allowed, and
+            # batches continue until files_processed (shared with the
+            # single-threaded path and across paths) reaches max_files.
+            # _process_file enforces the exact limit when paths run concurrently
+            while not self._max_files_reached():
+                if self.max_files:
+                    batch = list(islice(candidates, self.max_files - self.files_processed))
+                else:
+                    batch = list(candidates)
+                if not batch:
+                    break
+                
+                future_to_file = {
+                    executor.submit(self._process_file, filepath): filepath
+                    for filepath in batch
+                }
+                
+                # Yield results as they complete
+                for future in as_completed(future_to_file):
+                    filepath = future_to_file[future]
+                    try:
+                        doc_info = future.result()
+                        if doc_info:
+                            yield doc_info
+                    except Exception as e:
+                        self.logger.error(f"Error processing {filepath}: {e}")
+                        self._increment_stat('errors')
+    
+    def _walk_candidate_files(self, directory: Path, recursive: bool) -> Iterator[Path]:
+        """
+        Walk directory and yield files passing the name-based filters, so
+        rejected files are never stat'ed or read.
+        """
         for root, dirs, files in os.walk(directory, followlinks=self.follow_symlinks):
             root_path = Path(root)
             
@@ -140,33 +187,20 @@ class LocalCrawler(BaseCrawler):
                 dirs.clear()  # Don't descend further
                 continue
             
-            # Add files
-            for filename in files:
-                filepath = root_path / filename
-                all_files.append(filepath)
-                self.files_found += 1
-            
             if not recursive:
                 dirs.clear()  # Don't recurse
-        
-        # Process files in parallel
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
-            # Submit all file processing tasks
-            future_to_file = {
-                executor.submit(self._process_file, filepath): filepath 
-                for filepath in all_files
-            }
             
-            # Yield results as they complete
-            for future in as_completed(future_to_file):
-                filepath = future_to_file[future]
-                try:
-                    doc_info = future.result()
-                    if doc_info:
-                        yield doc_info
-                except Exception as e:
-                    self.logger.error(f"Error processing {filepath}: {e}")
-                    self.errors += 1
+            for filename in files:
+                filepath = root_path / filename
+                self._increment_stat('files_found')
+                if not self.should_process_filename(str(filepath)):
+                    self._increment_stat('files_skipped')
+                    continue
+                yield filepath
+    
+    def _max_files_reached(self) -> bool:
+        """Whether max_files files have been processed since statistics were last reset"""
+        return bool(self.max_files) and self.files_processed >= self.max_files
     
     def _process_file(self, filepath: Path) -> Optional[DocumentInfo]:
         """
@@ -178,13 +212,20 @@ class LocalCrawler(BaseCrawler):
         Returns:
             DocumentInfo: Document information, or None if skipped/error
         """
+        claimed = False
         try:
             # Get file stats
             stat = filepath.stat()
             
-            # Check if file should be processed
-            if not self.should_process_file(str(filepath), stat.st_size):
-                self.files_skipped += 1
+            # Check the size limit (name-based filters were applied before stat)
+            if not self.should_process_size(stat.st_size):
+                self._increment_stat('files_skipped')
+                return None
+            
+            # Count the file against max_files before reading it, so that
+            # concurrent scans of several paths stop at the shared limit
+            claimed = self._claim_file_slot()
+            if not claimed:
                 return None
             
             # Create document info
@@ -203,10 +244,11 @@ class LocalCrawler(BaseCrawler):
             else:
                 algorithm = "sha256"
             
-            doc_info.sha256_hash = self.calculate_file_hash(str(filepath), "sha256")
-            if algorithm != "sha256":
-                if algorithm == "md5":
-                    doc_info.md5_hash = self.calculate_file_hash(str(filepath), "md5")
+            # All requested digests come from one read of the file
+            algorithms = ["sha256", "md5"] if algorithm == "md5" else ["sha256"]
+            hashes = self.calculate_file_hashes(str(filepath), algorithms)
+            doc_info.sha256_hash = hashes["sha256"]
+            doc_info.md5_hash = hashes.get("md5")
             
             # Add file metadata
             doc_info.metadata.update({
@@ -227,18 +269,21 @@ class LocalCrawler(BaseCrawler):
                     'group_gid': stat.st_gid,
                 })
             
-            self.files_processed += 1
             doc_info.processed = True
             
             return doc_info
             
         except PermissionError:
             self.logger.warning(f"Permission denied: {filepath}")
-            self.files_skipped += 1
+            if claimed:
+                self._increment_stat('files_processed', -1)
+            self._increment_stat('files_skipped')
             return None
         except Exception as e:
             self.logger.error(f"Error processing file {filepath}: {e}")
-            self.errors += 1
+            if claimed:
+                self._increment_stat('files_processed', -1)
+            self._increment_stat('errors')
             
             # Return partial info with error
             return DocumentInfo(
@@ -5,7 +5,7 @@ Coordinates different crawler implementations and provides unified interface.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
@@ -102,11 +102,13 @@ class DocumentCrawler:
         
         logger.info(f"Starting document crawl with {len(self.crawlers)} crawlers")
         
-        # Use parallel execution if multiple crawlers
-        if len(self.crawlers) > 1:
-            all_documents = self._crawl_parallel(paths)
+        # Every (crawler, path) task runs in its own job, so per-path I/O
+        # overlaps; crawlers keep thread-safe statistics and max_files counts
+        tasks = self._get_crawl_tasks(paths)
+        if len(tasks) > 1:
+            all_documents = self._crawl_parallel(tasks)
         else:
-            all_documents = self._crawl_sequential(paths)
+            all_documents = self._crawl_sequential(tasks)
         
         end_time = time.time()
         duration = end_time - start_time
@@ -118,41 +120,43 @@ class DocumentCrawler:
         
         return all_documents
     
-    def _crawl_parallel(self, paths: List[str] = None) -> List[DocumentInfo]:
-        """Crawl sources in parallel."""
+    def _get_crawl_tasks(self, paths: List[str] = None) -> List[Tuple[str, BaseCrawler, Optional[str]]]:
+        """List (crawler name, crawler, path) crawl tasks for all crawlers."""
+        tasks = []
+        
+        for crawler_name, crawler in self.crawlers.items():
+            if crawler_name == 'local' and paths:
+                # For local crawler, use provided paths
+                tasks.extend((crawler_name, crawler, path) for path in paths)
+            elif crawler_name == 'sharepoint_onprem':
+                # For SharePoint, use configured site collections or provided paths
+                sites = paths if paths else getattr(crawler, 'site_collections', ['/'])
+                tasks.extend((crawler_name, crawler, site) for site in sites)
+            elif crawler_name == 'onenote':
+                # For OneNote, use provided paths or default
+                onenote_paths = paths if paths else ['/']
+                tasks.extend((crawler_name, crawler, path) for path in onenote_paths)
+            else:
+                # For other crawlers, use default crawling
+                tasks.append((crawler_name, crawler, paths[0] if paths else None))
+        
+        return tasks
+    
+    def _crawl_parallel(self, tasks: List[Tuple[str, BaseCrawler, Optional[str]]]) -> List[DocumentInfo]:
+        """Crawl tasks in parallel."""
         all_documents = []
         max_workers = self.config.get('crawler.parallel_workers', 4)
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit crawler tasks
-            future_to_crawler = {}
-            
-            for crawler_name, crawler in self.crawlers.items():
-                if crawler_name == 'local' and paths:
-                    # For local crawler, use provided paths
-                    for path in paths:
-                        future = executor.submit(crawler.crawl_path, path)
-                        future_to_crawler[future] = (crawler_name, path)
-                elif crawler_name == 'sharepoint_onprem':
-                    # For SharePoint, use configured site collections or provided paths
-                    sites = paths if paths else getattr(crawler, 'site_collections', ['/'])
-                    for site in sites:
-                        future = executor.submit(crawler.crawl_path, site)
-                        future_to_crawler[future] = (crawler_name, site)
-                elif crawler_name == 'onenote':
-                    # For OneNote, use provided paths or default
-                    onenote_paths = paths if paths else ['/']
-                    for path in onenote_paths:
-                        future = executor.submit(crawler.crawl_path, path)
-                        future_to_crawler[future] = (crawler_name, path)
-                else:
-                    # For other crawlers, use default crawling
-                    future = executor.submit(crawler.crawl_path, paths[0] if paths else None)
-                    future_to_crawler[future] = (crawler_name, 'default')
+            # Submit one job per (crawler, path) task
+            future_to_task = {
+                executor.submit(crawler.crawl_path, path): (crawler_name, path)
+                for crawler_name, crawler, path in tasks
+            }
             
             # Collect results
-            for future in as_completed(future_to_crawler):
-                crawler_name, path = future_to_crawler[future]
+            for future in as_completed(future_to_task):
+                crawler_name, path = future_to_task[future]
                 try:
                     documents = future.result()
                     all_documents.extend(documents)
@@ -162,42 +166,18 @@ class DocumentCrawler:
         
         return all_documents
     
-    def _crawl_sequential(self, paths: List[str] = None) -> List[DocumentInfo]:
-        """Crawl sources sequentially."""
+    def _crawl_sequential(self, tasks: List[Tuple[str, BaseCrawler, Optional[str]]]) -> List[DocumentInfo]:
+        """Crawl tasks sequentially."""
         all_documents = []
         
-        for crawler_name, crawler in self.crawlers.items():
+        for crawler_name, crawler, path in tasks:
             try:
                 logger.info(f"Starting {crawler_name} crawler")
-                
-                if crawler_name == 'local' and paths:
-                    # Crawl each provided path
-                    for path in paths:
-                        documents = crawler.crawl_path(path)
-                        all_documents.extend(documents)
-                        logger.info(f"{crawler_name} crawler found {len(documents)} documents in {path}")
-                elif crawler_name == 'sharepoint_onprem':
-                    # Crawl SharePoint sites
-                    sites = paths if paths else getattr(crawler, 'site_collections', ['/'])
-                    for site in sites:
-                        documents = crawler.crawl_path(site)
-                        all_documents.extend(documents)
-                        logger.info(f"{crawler_name} crawler found {len(documents)} documents in {site}")
-                elif crawler_name == 'onenote':
-                    # Crawl OneNote
-                    onenote_paths = paths if paths else ['/']
-                    for path in onenote_paths:
-                        documents = crawler.crawl_path(path)
-                        all_documents.extend(documents)
-                        logger.info(f"{crawler_name} crawler found {len(documents)} documents in {path}")
-                else:
-                    # Default crawling
-                    documents = crawler.crawl_path(paths[0] if paths else None)
-                    all_documents.extend(documents)
-                    logger.info(f"{crawler_name} crawler found {len(documents)} documents")
-                    
+                documents = crawler.crawl_path(path)
+                all_documents.extend(documents)
+                logger.info(f"{crawler_name} crawler found {len(documents)} documents in {path}")
             except Exception as e:
-                logger.error(f"Error in {crawler_name} crawler: {e}")
+                logger.error(f"Error in {crawler_name} crawler for {path}: {e}")
         
         return all_documents
     
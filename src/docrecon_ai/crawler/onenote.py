@@ -63,6 +63,11 @@ class OneNoteCrawler(BaseCrawler):
             'errors_encountered': 0
         }
     
+    def _increment_stat(self, name: str, amount: int = 1):
+        """Thread-safely add amount to the statistics entry name"""
+        with self._stats_lock:
+            self.stats[name] += amount
+    
     def _initialize_com_interface(self):
         """Initialize OneNote COM interface for local access."""
         try:
@@ -100,7 +105,7 @@ class OneNoteCrawler(BaseCrawler):
                 
         except Exception as e:
             logger.error(f"Error crawling OneNote documents: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         self.stats['documents_processed'] = len(documents)
         logger.info(f"OneNote crawl completed. Found {len(documents)} documents.")
@@ -133,13 +138,13 @@ class OneNoteCrawler(BaseCrawler):
                 documents.extend(processed_docs)
                 
                 if doc.file_extension.lower() == '.one':
-                    self.stats['notebooks_found'] += 1
+                    self._increment_stat('notebooks_found')
                 elif doc.file_extension.lower() == '.onetoc2':
-                    self.stats['sections_found'] += 1
+                    self._increment_stat('sections_found')
                     
         except Exception as e:
             logger.error(f"Error crawling SharePoint OneNote files: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -162,11 +167,11 @@ class OneNoteCrawler(BaseCrawler):
             for notebook in root.findall('.//{http://schemas.microsoft.com/office/onenote/2013/onenote}Notebook'):
                 notebook_docs = self._process_notebook_com(notebook)
                 documents.extend(notebook_docs)
-                self.stats['notebooks_found'] += 1
+                self._increment_stat('notebooks_found')
                 
         except Exception as e:
             logger.error(f"Error crawling OneNote via COM: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -187,13 +192,13 @@ class OneNoteCrawler(BaseCrawler):
                             documents.extend(processed_docs)
                             
                             if file_ext == '.one':
-                                self.stats['notebooks_found'] += 1
+                                self._increment_stat('notebooks_found')
                             elif file_ext == '.onetoc2':
-                                self.stats['sections_found'] += 1
+                                self._increment_stat('sections_found')
                                 
         except Exception as e:
             logger.error(f"Error crawling local OneNote files: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -231,11 +236,11 @@ class OneNoteCrawler(BaseCrawler):
                 for section in notebook_element.findall('.//{http://schemas.microsoft.com/office/onenote/2013/onenote}Section'):
                     section_docs = self._process_section_com(section, notebook_name)
                     documents.extend(section_docs)
-                    self.stats['sections_found'] += 1
+                    self._increment_stat('sections_found')
                     
         except Exception as e:
             logger.error(f"Error processing notebook via COM: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -275,11 +280,11 @@ class OneNoteCrawler(BaseCrawler):
                     page_doc = self._process_page_com(page, section_name, notebook_name)
                     if page_doc:
                         documents.append(page_doc)
-                        self.stats['pages_found'] += 1
+                        self._increment_stat('pages_found')
                         
         except Exception as e:
             logger.error(f"Error processing section via COM: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -329,7 +334,7 @@ class OneNoteCrawler(BaseCrawler):
             
         except Exception as e:
             logger.error(f"Error processing page via COM: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
             return None
     
     def _process_onenote_file(self, doc_info: DocumentInfo) -> List[DocumentInfo]:
@@ -357,7 +362,7 @@ class OneNoteCrawler(BaseCrawler):
                     
         except Exception as e:
             logger.error(f"Error processing OneNote file {doc_info.filename}: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -425,7 +430,7 @@ class OneNoteCrawler(BaseCrawler):
                 
         except Exception as e:
             logger.error(f"Error extracting OneNote package: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -63,6 +63,11 @@ class SharePointOnPremCrawler(BaseCrawler):
             'api_calls_made': 0
         }
     
+    def _increment_stat(self, name: str, amount: int = 1):
+        """Thread-safely add amount to the statistics entry name"""
+        with self._stats_lock:
+            self.stats[name] += amount
+    
     def _initialize_session(self):
         """Initialize HTTP session with appropriate authentication."""
         self.session = requests.Session()
@@ -120,7 +125,7 @@ class SharePointOnPremCrawler(BaseCrawler):
         """Make authenticated API request with retry logic."""
         for attempt in range(self.retry_attempts):
             try:
-                self.stats['api_calls_made'] += 1
+                self._increment_stat('api_calls_made')
                 response = self.session.get(url, params=params)
                 
                 if response.status_code == 200:
@@ -147,7 +152,7 @@ class SharePointOnPremCrawler(BaseCrawler):
             if attempt < self.retry_attempts - 1:
                 time.sleep(2 ** attempt)  # Exponential backoff
         
-        self.stats['errors_encountered'] += 1
+        self._increment_stat('errors_encountered')
         return None
     
     def crawl_path(self, path: str) -> List[DocumentInfo]:
@@ -174,11 +179,11 @@ class SharePointOnPremCrawler(BaseCrawler):
             for site_path in sites_to_crawl:
                 site_documents = self._crawl_site(site_path)
                 documents.extend(site_documents)
-                self.stats['sites_crawled'] += 1
+                self._increment_stat('sites_crawled')
                 
         except Exception as e:
             logger.error(f"Error crawling SharePoint path {path}: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         self.stats['documents_found'] = len(documents)
         logger.info(f"SharePoint crawl completed. Found {len(documents)} documents.")
@@ -207,7 +212,7 @@ class SharePointOnPremCrawler(BaseCrawler):
             for library_name in self.document_libraries:
                 library_documents = self._crawl_document_library(site_url, library_name)
                 documents.extend(library_documents)
-                self.stats['libraries_crawled'] += 1
+                self._increment_stat('libraries_crawled')
             
             # Crawl subsites if enabled
             if self.include_subsites:
@@ -221,7 +226,7 @@ class SharePointOnPremCrawler(BaseCrawler):
                         
         except Exception as e:
             logger.error(f"Error crawling site {site_path}: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
@@ -279,7 +284,7 @@ class SharePointOnPremCrawler(BaseCrawler):
                     
         except Exception as e:
             logger.error(f"Error crawling document library {library_name}: {e}")
-            self.stats['errors_encountered'] += 1
+            self._increment_stat('errors_encountered')
         
         return documents
     
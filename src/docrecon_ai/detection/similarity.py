@@ -5,9 +5,12 @@ Detects documents with similar content using embeddings and semantic analysis.
 Useful for finding near-duplicates, different versions, and related documents.
 """
 
+import os
 import numpy as np
-from collections import defaultdict
-from typing import List, Dict, Any, Optional, Tuple, Set
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
 from ..crawler.base import DocumentInfo
@@ -16,13 +19,43 @@ logger = logging.getLogger(__name__)
 
 # Optional similarity dependencies
 try:
-    from sklearn.metrics.pairwise import cosine_similarity
+    from scipy.sparse import csr_matrix
     from sklearn.cluster import DBSCAN
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
     logger.warning("scikit-learn not available. Install: pip install scikit-learn")
 
+# Optional JIT acceleration for within-group pair statistics
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _pair_similarity_stats(vectors: np.ndarray) -> Tuple[float, float, float]:
+    """Mean, min and max dot product over all distinct row pairs, without an n x n buffer"""
+    n_vectors, dim = vectors.shape
+    total = 0.0
+    min_similarity = np.inf
+    max_similarity = -np.inf
+    
+    for i in range(n_vectors):
+        for j in range(i + 1, n_vectors):
+            similarity = 0.0
+            for k in range(dim):
+                similarity += vectors[i, k] * vectors[j, k]
+            total += similarity
+            min_similarity = min(min_similarity, similarity)
+            max_similarity = max(max_similarity, similarity)
+    
+    return total / (n_vectors * (n_vectors - 1) // 2), min_similarity, max_similarity
+
+
+if NUMBA_AVAILABLE:
+    _pair_similarity_stats = njit(cache=True, fastmath=True)(_pair_similarity_stats)
+
 
 class SimilarityAnalyzer:
     """
@@ -49,6 +82,9 @@ class SimilarityAnalyzer:
         self.similarity_threshold = getattr(config.duplicates, 'content_similarity_threshold', 0.9) if config else 0.9
         self.size_tolerance = getattr(config.duplicates, 'size_tolerance', 0.05) if config else 0.05
         self.enable_fuzzy_matching = getattr(config.duplicates, 'enable_fuzzy_matching', True) if config else True
+        self.block_size = 1024  # Rows per similarity block
+        self.max_stored_similarities = 1_000_000  # Sparse entries kept on the instance
+        self.tree_search_threshold = 5000  # Above this, use ball-tree DBSCAN instead
         
         # Statistics
         self.documents_processed = 0
@@ -58,6 +94,8 @@ class SimilarityAnalyzer:
         # Results
         self.similarity_matrix = None
         self.similarity_groups = []
+        self.embedding_matrix = None
+        self.document_index = {}
     
     def find_similar_documents(self, documents: List[DocumentInfo], 
                               embeddings: Dict[str, np.ndarray]) -> Dict[str, Any]:
@@ -93,13 +131,29 @@ class SimilarityAnalyzer:
             self.logger.warning("No matching embeddings found for documents")
             return {'similarity_groups': [], 'statistics': {}}
         
-        # Calculate similarity matrix
-        similarity_matrix = self._calculate_similarity_matrix(filtered_embeddings)
-        self.similarity_matrix = similarity_matrix
+        doc_ids, embedding_matrix = self._build_embedding_matrix(filtered_embeddings)
+        n_docs = len(doc_ids)
+        
+        # Calculate thresholded similarity matrix; large corpora skip it and
+        # let a ball-tree neighbor search find the groups directly
+        if n_docs > self.tree_search_threshold:
+            similarity_matrix = None
+        else:
+            similarity_matrix = self._calculate_similarity_matrix(embedding_matrix)
+        self.comparisons_made = n_docs * (n_docs - 1) // 2
+        
+        # Only pin the sparse matrix on the instance while it stays small;
+        # any pair similarity can be recomputed through get_similarity()
+        self.embedding_matrix = embedding_matrix
+        self.document_index = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        if similarity_matrix is not None and similarity_matrix.nnz <= self.max_stored_similarities:
+            self.similarity_matrix = similarity_matrix
+        else:
+            self.similarity_matrix = None
         
         # Find similarity groups
         similarity_groups = self._find_similarity_groups(
-            filtered_embeddings, similarity_matrix, doc_id_to_info
+            doc_ids, embedding_matrix, similarity_matrix, doc_id_to_info
         )
         
         # Analyze groups for additional insights
@@ -113,7 +167,7 @@ class SimilarityAnalyzer:
             'method': 'semantic_similarity',
             'similarity_threshold': self.similarity_threshold,
             'similarity_groups': enhanced_groups,
-            'similarity_matrix_shape': similarity_matrix.shape,
+            'similarity_matrix_shape': (n_docs, n_docs),
             'statistics': {
                 'documents_processed': self.documents_processed,
                 'similarity_groups_found': self.similarity_groups_found,
@@ -124,63 +178,122 @@ class SimilarityAnalyzer:
         
         return results
     
-    def _calculate_similarity_matrix(self, embeddings: Dict[str, np.ndarray]) -> np.ndarray:
-        """Calculate pairwise similarity matrix for all embeddings"""
-        doc_ids = list(embeddings.keys())
-        embedding_matrix = np.array(list(embeddings.values()))
+    def _build_embedding_matrix(self, embeddings: Dict[str, np.ndarray]) -> Tuple[List[str], np.ndarray]:
+        """Stack embeddings into an L2-normalized matrix, returning row-aligned document IDs"""
+        doc_ids, vectors = zip(*embeddings.items())
         
-        # Calculate cosine similarity matrix
-        similarity_matrix = cosine_similarity(embedding_matrix)
+        # Fill a preallocated contiguous float32 buffer instead of going
+        # through an intermediate list of arrays
+        embedding_matrix = np.empty((len(vectors), np.size(vectors[0])), dtype=np.float32)
+        for i, embedding in enumerate(vectors):
+            embedding_matrix[i] = np.ravel(embedding)
         
-        self.comparisons_made = len(doc_ids) * (len(doc_ids) - 1) // 2
+        norms = np.linalg.norm(embedding_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
         
-        return similarity_matrix
+        return list(doc_ids), embedding_matrix / norms
     
-    def _find_similarity_groups(self, embeddings: Dict[str, np.ndarray], 
-                               similarity_matrix: np.ndarray,
-                               doc_id_to_info: Dict[str, DocumentInfo]) -> List[Dict[str, Any]]:
-        """Find groups of similar documents using clustering"""
-        doc_ids = list(embeddings.keys())
+    def _calculate_similarity_matrix(self, embedding_matrix: np.ndarray) -> 'csr_matrix':
+        """
+        Calculate the thresholded pairwise similarity matrix.
         
-        # Use DBSCAN clustering to find similarity groups
-        # Convert similarity to distance (1 - similarity)
-        distance_matrix = 1 - similarity_matrix
+        Similarities are computed one row block at a time and thresholded
+        immediately, so only pairs at or above the similarity threshold are
+        ever stored. The sparse result doubles as the neighborhood graph for
+        the DBSCAN label propagation in _find_similarity_groups.
+        """
+        n_docs = embedding_matrix.shape[0]
         
-        # Set DBSCAN parameters
-        eps = 1 - self.similarity_threshold  # Distance threshold
-        min_samples = 2  # Minimum group size
+        counts = np.zeros(n_docs, dtype=np.int64)
+        indices = []
+        data = []
+        
+        for start in range(0, n_docs, self.block_size):
+            block = embedding_matrix[start:start + self.block_size] @ embedding_matrix.T
+            rows, cols = np.nonzero(block >= self.similarity_threshold)
+            
+            counts[start:start + block.shape[0]] = np.bincount(rows, minlength=block.shape[0])
+            indices.append(cols)
+            data.append(block[rows, cols])
         
-        # Perform clustering
-        clustering = DBSCAN(eps=eps, min_samples=min_samples, metric='precomputed')
-        cluster_labels = clustering.fit_predict(distance_matrix)
+        indptr = np.concatenate(([0], np.cumsum(counts)))
         
-        # Group documents by cluster
+        return csr_matrix(
+            (np.concatenate(data), np.concatenate(indices), indptr),
+            shape=(n_docs, n_docs)
+        )
+    
+    def _propagate_cluster_labels(self, similarity_matrix: 'csr_matrix', min_samples: int) -> np.ndarray:
+        """DBSCAN label propagation over a thresholded similarity graph (noise is -1)"""
+        indptr = similarity_matrix.indptr
+        indices = similarity_matrix.indices
+        
+        # Neighborhoods include the point itself, as in DBSCAN
+        is_core = np.diff(indptr) >= min_samples
+        labels = np.full(similarity_matrix.shape[0], -1, dtype=np.int64)
+        
+        cluster_id = 0
+        for i in range(len(labels)):
+            if labels[i] != -1 or not is_core[i]:
+                continue
+            
+            labels[i] = cluster_id
+            stack = [i]
+            while stack:
+                point = stack.pop()
+                for neighbor in indices[indptr[point]:indptr[point + 1]]:
+                    if labels[neighbor] == -1:
+                        labels[neighbor] = cluster_id
+                        if is_core[neighbor]:
+                            stack.append(neighbor)
+            
+            cluster_id += 1
+        
+        return labels
+    
+    def _find_similarity_groups(self, doc_ids: List[str], 
+                               embedding_matrix: np.ndarray,
+                               similarity_matrix: Optional['csr_matrix'],
+                               doc_id_to_info: Dict[str, DocumentInfo]) -> List[Dict[str, Any]]:
+        """Find groups of similar documents using clustering"""
+        min_samples = 2  # Minimum group size
+        
+        if similarity_matrix is not None:
+            # DBSCAN over the thresholded similarity graph
+            cluster_labels = self._propagate_cluster_labels(similarity_matrix, min_samples)
+        else:
+            # On unit vectors ||a - b||^2 = 2 - 2 cos(a, b), so the cosine
+            # threshold maps to a Euclidean radius that ball trees support
+            eps = max(np.sqrt(2 * (1 - self.similarity_threshold)), 1e-6)
+            clustering = DBSCAN(eps=eps, min_samples=min_samples, metric='euclidean',
+                                algorithm='ball_tree', n_jobs=-1)
+            cluster_labels = clustering.fit_predict(embedding_matrix)
+        
+        # Group document indices by cluster
         clusters = defaultdict(list)
         for i, label in enumerate(cluster_labels):
             if label != -1:  # Ignore noise points
-                clusters[label].append(doc_ids[i])
+                clusters[label].append(i)
         
         # Create similarity groups
         similarity_groups = []
-        for cluster_id, doc_ids_in_cluster in clusters.items():
-            if len(doc_ids_in_cluster) >= 2:
-                # Calculate average similarity within group
-                similarities = []
-                for i, doc_id1 in enumerate(doc_ids_in_cluster):
-                    for doc_id2 in doc_ids_in_cluster[i+1:]:
-                        idx1 = doc_ids.index(doc_id1)
-                        idx2 = doc_ids.index(doc_id2)
-                        similarities.append(similarity_matrix[idx1, idx2])
+        for cluster_id, cluster_indices in clusters.items():
+            if len(cluster_indices) >= 2:
+                doc_ids_in_cluster = [doc_ids[i] for i in cluster_indices]
                 
-                avg_similarity = np.mean(similarities) if similarities else 0.0
+                # Calculate average similarity within group, including pairs
+                # below the threshold that DBSCAN chained together
+                avg_similarity, min_similarity, max_similarity = self._calculate_pair_statistics(
+                    embedding_matrix[cluster_indices]
+                )
                 
                 group = {
                     'group_id': f"sim_{cluster_id}",
                     'type': 'semantic_similarity',
                     'document_count': len(doc_ids_in_cluster),
-                    'avg_similarity': float(avg_similarity),
-                    'min_similarity': float(np.min(similarities)) if similarities else 0.0,
-                    'max_similarity': float(np.max(similarities)) if similarities else 0.0,
+                    'avg_similarity': avg_similarity,
+                    'min_similarity': min_similarity,
+                    'max_similarity': max_similarity,
                     'document_ids': doc_ids_in_cluster,
                     'documents': [self._document_to_dict(doc_id_to_info[doc_id]) for doc_id in doc_ids_in_cluster],
                 }
@@ -189,114 +302,131 @@ class SimilarityAnalyzer:
         
         return similarity_groups
     
+    def _calculate_pair_statistics(self, vectors: np.ndarray) -> Tuple[float, float, float]:
+        """Average, minimum and maximum similarity over all pairs of (normalized) vectors"""
+        if NUMBA_AVAILABLE:
+            avg_similarity, min_similarity, max_similarity = _pair_similarity_stats(vectors)
+            return float(avg_similarity), float(min_similarity), float(max_similarity)
+        
+        pair_rows, pair_cols = np.triu_indices(len(vectors), k=1)
+        similarities = (vectors @ vectors.T)[pair_rows, pair_cols]
+        
+        return float(np.mean(similarities)), float(np.min(similarities)), float(np.max(similarities))
+    
     def _enhance_similarity_groups(self, similarity_groups: List[Dict[str, Any]], 
                                   doc_id_to_info: Dict[str, DocumentInfo]) -> List[Dict[str, Any]]:
         """Enhance similarity groups with additional analysis"""
-        enhanced_groups = []
+        return [self._enhance_similarity_group(group, doc_id_to_info) for group in similarity_groups]
+    
+    def _enhance_similarity_group(self, group: Dict[str, Any],
+                                  doc_id_to_info: Dict[str, DocumentInfo]) -> Dict[str, Any]:
+        """Enhance a single similarity group with additional analysis"""
+        enhanced_group = group.copy()
+        
+        # Analyze file characteristics
+        docs = [doc_id_to_info[doc_id] for doc_id in group['document_ids']]
+        
+        # File size analysis
+        sizes = [doc.size for doc in docs]
+        enhanced_group['size_analysis'] = {
+            'min_size': min(sizes),
+            'max_size': max(sizes),
+            'avg_size': np.mean(sizes),
+            'size_variance': np.var(sizes),
+            'similar_sizes': self._check_similar_sizes(sizes),
+        }
         
-        for group in similarity_groups:
-            enhanced_group = group.copy()
-            
-            # Analyze file characteristics
-            docs = [doc_id_to_info[doc_id] for doc_id in group['document_ids']]
-            
-            # File size analysis
-            sizes = [doc.size for doc in docs]
-            enhanced_group['size_analysis'] = {
-                'min_size': min(sizes),
-                'max_size': max(sizes),
-                'avg_size': np.mean(sizes),
-                'size_variance': np.var(sizes),
-                'similar_sizes': self._check_similar_sizes(sizes),
-            }
-            
-            # File type analysis
-            extensions = [doc.file_extension for doc in docs]
-            enhanced_group['file_type_analysis'] = {
-                'extensions': list(set(extensions)),
-                'same_extension': len(set(extensions)) == 1,
-                'extension_distribution': {ext: extensions.count(ext) for ext in set(extensions)},
+        # File type analysis
+        extension_counts = Counter(doc.file_extension for doc in docs)
+        enhanced_group['file_type_analysis'] = {
+            'extensions': list(extension_counts),
+            'same_extension': len(extension_counts) == 1,
+            'extension_distribution': dict(extension_counts),
+        }
+        
+        # Path analysis (each path is parsed once; groups are disjoint). Done
+        # for every group, as relationship types depend on the directories
+        paths = [doc.path for doc in docs]
+        directory_distribution = self._analyze_directory_distribution(
+            [str(Path(p).parent) for p in paths]
+        )
+        enhanced_group['path_analysis'] = {
+            'common_directory': self._find_common_directory(paths),
+            'same_directory': len(directory_distribution) == 1,
+            'directory_distribution': directory_distribution,
+        }
+        
+        # Cheap prescreen: only groups with one extension and similar sizes
+        # get the temporal/content analysis here; find_content_variants adds
+        # it to the other groups it returns
+        enhanced_group['partial'] = not (enhanced_group['file_type_analysis']['same_extension'] and
+                                         enhanced_group['size_analysis']['similar_sizes'])
+        if not enhanced_group['partial']:
+            self._add_detailed_analysis(enhanced_group, docs)
+        
+        # Determine likely relationship type
+        enhanced_group['relationship_type'] = self._determine_relationship_type(enhanced_group)
+        
+        return enhanced_group
+    
+    def _add_detailed_analysis(self, enhanced_group: Dict[str, Any], docs: List[DocumentInfo]):
+        """Add the temporal and content length analysis skipped for partial groups"""
+        # Temporal analysis (vectorized; isoformat only for the two extremes)
+        dated_docs = [doc for doc in docs if doc.modified_date]
+        if dated_docs:
+            mod_dates = self._to_datetime64([doc.modified_date for doc in dated_docs])
+            oldest = int(np.argmin(mod_dates))
+            newest = int(np.argmax(mod_dates))
+            enhanced_group['temporal_analysis'] = {
+                'date_range_days': int((mod_dates[newest] - mod_dates[oldest]) // np.timedelta64(1, 'D')),
+                'oldest_file': dated_docs[oldest].modified_date.isoformat(),
+                'newest_file': dated_docs[newest].modified_date.isoformat(),
             }
-            
-            # Temporal analysis
-            mod_dates = [doc.modified_date for doc in docs if doc.modified_date]
-            if mod_dates:
-                enhanced_group['temporal_analysis'] = {
-                    'date_range_days': (max(mod_dates) - min(mod_dates)).days,
-                    'oldest_file': min(mod_dates).isoformat(),
-                    'newest_file': max(mod_dates).isoformat(),
-                }
-            
-            # Path analysis
-            paths = [doc.path for doc in docs]
-            enhanced_group['path_analysis'] = {
-                'common_directory': self._find_common_directory(paths),
-                'same_directory': len(set([str(Path(p).parent) for p in paths])) == 1,
-                'directory_distribution': self._analyze_directory_distribution(paths),
+        
+        # Content length analysis (if available)
+        text_lengths = [doc.text_length for doc in docs if doc.text_length > 0]
+        if text_lengths:
+            enhanced_group['content_analysis'] = {
+                'min_length': min(text_lengths),
+                'max_length': max(text_lengths),
+                'avg_length': np.mean(text_lengths),
+                'length_variance': np.var(text_lengths),
             }
-            
-            # Content length analysis (if available)
-            text_lengths = [doc.text_length for doc in docs if doc.text_length > 0]
-            if text_lengths:
-                enhanced_group['content_analysis'] = {
-                    'min_length': min(text_lengths),
-                    'max_length': max(text_lengths),
-                    'avg_length': np.mean(text_lengths),
-                    'length_variance': np.var(text_lengths),
-                }
-            
-            # Determine likely relationship type
-            enhanced_group['relationship_type'] = self._determine_relationship_type(enhanced_group)
-            
-            enhanced_groups.append(enhanced_group)
         
-        return enhanced_groups
+        enhanced_group['partial'] = False
+    
+    def _to_datetime64(self, dates: List[datetime]) -> np.ndarray:
+        """Convert datetimes to datetime64, normalizing timezone-aware values to naive UTC"""
+        return np.array(
+            [date.astimezone(timezone.utc).replace(tzinfo=None) if date.tzinfo else date for date in dates],
+            dtype='datetime64[us]'
+        )
     
     def _check_similar_sizes(self, sizes: List[int]) -> bool:
         """Check if file sizes are similar within tolerance"""
         if len(sizes) < 2:
             return True
         
-        avg_size = np.mean(sizes)
+        # Only the extremes can violate the tolerance band around the mean
+        avg_size = sum(sizes) / len(sizes)
         tolerance = avg_size * self.size_tolerance
         
-        return all(abs(size - avg_size) <= tolerance for size in sizes)
+        return max(sizes) - avg_size <= tolerance and avg_size - min(sizes) <= tolerance
     
     def _find_common_directory(self, paths: List[str]) -> str:
         """Find common directory path for a list of file paths"""
         if not paths:
             return ""
         
-        from pathlib import Path
-        
-        # Convert to Path objects
-        path_objects = [Path(p) for p in paths]
-        
-        # Find common parent
-        common_parts = []
-        if path_objects:
-            # Get parts of first path
-            first_parts = path_objects[0].parts
-            
-            # Check each part
-            for i, part in enumerate(first_parts):
-                if all(len(p.parts) > i and p.parts[i] == part for p in path_objects):
-                    common_parts.append(part)
-                else:
-                    break
-        
-        return str(Path(*common_parts)) if common_parts else ""
+        try:
+            return os.path.commonpath(paths)
+        except ValueError:
+            # Mix of absolute and relative paths, or paths on different drives
+            return ""
     
-    def _analyze_directory_distribution(self, paths: List[str]) -> Dict[str, int]:
-        """Analyze distribution of files across directories"""
-        from pathlib import Path
-        
-        directories = [str(Path(p).parent) for p in paths]
-        distribution = {}
-        for directory in directories:
-            distribution[directory] = distribution.get(directory, 0) + 1
-        
-        return distribution
+    def _analyze_directory_distribution(self, directories: List[str]) -> Dict[str, int]:
+        """Analyze distribution of files across (pre-parsed) parent directories"""
+        return dict(Counter(directories))
     
     def _determine_relationship_type(self, group: Dict[str, Any]) -> str:
         """Determine the likely relationship type between similar documents"""
@@ -370,6 +500,7 @@ class SimilarityAnalyzer:
             list: Content variant groups
         """
         results = self.find_similar_documents(documents, embeddings)
+        doc_id_to_info = {self._get_document_id(doc): doc for doc in documents}
         
         content_variants = []
         for group in results['similarity_groups']:
@@ -379,6 +510,10 @@ class SimilarityAnalyzer:
                 
                 variant_group = group.copy()
                 variant_group['type'] = 'content_variants'
+                if variant_group.get('partial'):
+                    self._add_detailed_analysis(
+                        variant_group, [doc_id_to_info[doc_id] for doc_id in group['document_ids']]
+                    )
                 content_variants.append(variant_group)
         
         return content_variants
@@ -395,15 +530,34 @@ class SimilarityAnalyzer:
         Returns:
             float: Similarity score (0-1)
         """
-        # Reshape if needed
-        if doc1_embedding.ndim == 1:
-            doc1_embedding = doc1_embedding.reshape(1, -1)
-        if doc2_embedding.ndim == 1:
-            doc2_embedding = doc2_embedding.reshape(1, -1)
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(doc1_embedding, doc2_embedding)[0, 0]
-        return float(similarity)
+        # Plain normalized dot product; avoids sklearn's validation overhead
+        # for what is a single-pair computation
+        a = np.ravel(doc1_embedding)
+        b = np.ravel(doc2_embedding)
+        
+        norm_product = np.linalg.norm(a) * np.linalg.norm(b)
+        if norm_product == 0:
+            return 0.0
+        
+        return float(np.dot(a, b) / norm_product)
+    
+    def get_similarity(self, doc_id1: str, doc_id2: str) -> Optional[float]:
+        """
+        Get the similarity between two documents from the last analysis.
+        
+        Args:
+            doc_id1: First document ID
+            doc_id2: Second document ID
+            
+        Returns:
+            float: Similarity score, or None if either document was not analyzed
+        """
+        if doc_id1 not in self.document_index or doc_id2 not in self.document_index:
+            return None
+        
+        # Rows of the cached embedding matrix are already L2-normalized
+        return float(np.dot(self.embedding_matrix[self.document_index[doc_id1]],
+                            self.embedding_matrix[self.document_index[doc_id2]]))
     
     def _get_document_id(self, document: DocumentInfo) -> str:
         """Generate unique ID for a document"""
@@ -503,4 +657,6 @@ class SimilarityAnalyzer:
         self.comparisons_made = 0
         self.similarity_matrix = None
         self.similarity_groups = []
+        self.embedding_matrix = None
+        self.document_index = {}
 
@@ -6,7 +6,10 @@ version numbers, and common versioning conventions.
 """
 
 import re
+import hashlib
+import numpy as np
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional, Set, Tuple
 from pathlib import Path
 import logging
@@ -15,19 +18,68 @@ from ..crawler.base import DocumentInfo
 
 logger = logging.getLogger(__name__)
 
-# Optional fuzzy matching
+# Fuzzy filename matching
 try:
-    from difflib import SequenceMatcher
-    DIFFLIB_AVAILABLE = True
+    from rapidfuzz import fuzz as rapidfuzz_fuzz, process as rapidfuzz_process
+    RAPIDFUZZ_AVAILABLE = True
 except ImportError:
-    DIFFLIB_AVAILABLE = False
+    RAPIDFUZZ_AVAILABLE = False
+    logger.warning("rapidfuzz not available. Install: pip install rapidfuzz")
 
-try:
-    from fuzzywuzzy import fuzz
-    FUZZYWUZZY_AVAILABLE = True
-except ImportError:
-    FUZZYWUZZY_AVAILABLE = False
-    logger.warning("fuzzywuzzy not available. Install: pip install fuzzywuzzy")
+# Version patterns (regex patterns to identify version indicators)
+_VERSION_PATTERNS = [
+    # Version numbers: v1, v2.0, version1, ver2
+    r'[_\-\s]v(\d+)(?:\.(\d+))?(?:\.(\d+))?[_\-\s]?',
+    r'[_\-\s]version[_\-\s]?(\d+)(?:\.(\d+))?(?:\.(\d+))?[_\-\s]?',
+    r'[_\-\s]ver[_\-\s]?(\d+)(?:\.(\d+))?(?:\.(\d+))?[_\-\s]?',
+    
+    # Revision numbers: rev1, revision2, r3
+    r'[_\-\s]rev(?:ision)?[_\-\s]?(\d+)[_\-\s]?',
+    r'[_\-\s]r(\d+)[_\-\s]?',
+    
+    # Draft numbers: draft1, draft_2
+    r'[_\-\s]draft[_\-\s]?(\d+)[_\-\s]?',
+    
+    # Copy indicators: copy, copy(1), copy_2
+    r'[_\-\s]copy(?:[_\-\s]?\((\d+)\))?[_\-\s]?',
+    r'[_\-\s]copy[_\-\s]?(\d+)[_\-\s]?',
+    
+    # Final/backup indicators
+    r'[_\-\s](final|backup|old|new|latest|current)[_\-\s]?(\d+)?[_\-\s]?',
+    
+    # Date patterns: 20231201, 2023-12-01, 01122023
+    r'[_\-\s](\d{4})[_\-]?(\d{2})[_\-]?(\d{2})[_\-\s]?',
+    r'[_\-\s](\d{2})[_\-]?(\d{2})[_\-]?(\d{4})[_\-\s]?',
+    
+    # Timestamp patterns: 143000, 14-30-00
+    r'[_\-\s](\d{2})[_\-]?(\d{2})[_\-]?(\d{2})[_\-\s]?',
+    
+    # Parenthetical numbers: (1), (2), (copy)
+    r'\((\d+)\)',
+    r'\((copy|backup|final|old|new)\)',
+]
+
+_COMPILED_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in _VERSION_PATTERNS]
+
+# All patterns fused into one alternation (named group per pattern, in
+# pattern order) so a single scan tells whether a name has any indicator
+_COMBINED_PATTERN = re.compile(
+    '|'.join(f'(?P<g{i}>{pattern})' for i, pattern in enumerate(_VERSION_PATTERNS)),
+    re.IGNORECASE
+)
+
+# Every version pattern needs a digit or one of these words, so names
+# without any of them are rejected before the combined pattern runs
+_TRIGGER_PATTERN = re.compile(r'\d|copy|final|backup|old|new|latest|current', re.IGNORECASE)
+
+# Runs of separators collapsed when cleaning up base names
+_SEPARATOR_PATTERN = re.compile(r'[_\-\s]+')
+
+# Version info fields that count as version indicators
+_INDICATOR_FIELDS = ('version_number', 'revision_number', 'copy_indicator', 'date_info', 'special_indicators')
+
+# Word separators in filenames, mapped to spaces so str.split() can tokenize
+_SEPARATOR_TABLE = str.maketrans('_-.', '   ')
 
 
 class VersionDetector:
@@ -51,47 +103,29 @@ class VersionDetector:
         # Configuration
         self.filename_similarity_threshold = getattr(config.duplicates, 'filename_similarity_threshold', 0.8) if config else 0.8
         self.enable_fuzzy_matching = getattr(config.duplicates, 'enable_fuzzy_matching', True) if config else True
+        self.block_size = 1024  # Rows per fuzzy matching block
+        self.parallel_threshold = 2000  # Candidate groups before analysis uses worker processes
+        self.threads = getattr(config.crawler, 'threads', 4) if config else 4
         
-        # Version patterns (regex patterns to identify version indicators)
-        self.version_patterns = [
-            # Version numbers: v1, v2.0, version1, ver2
-            r'[_\-\s]v(\d+)(?:\.(\d+))?(?:\.(\d+))?[_\-\s]?',
-            r'[_\-\s]version[_\-\s]?(\d+)(?:\.(\d+))?(?:\.(\d+))?[_\-\s]?',
-            r'[_\-\s]ver[_\-\s]?(\d+)(?:\.(\d+))?(?:\.(\d+))?[_\-\s]?',
-            
-            # Revision numbers: rev1, revision2, r3
-            r'[_\-\s]rev(?:ision)?[_\-\s]?(\d+)[_\-\s]?',
-            r'[_\-\s]r(\d+)[_\-\s]?',
-            
-            # Draft numbers: draft1, draft_2
-            r'[_\-\s]draft[_\-\s]?(\d+)[_\-\s]?',
-            
-            # Copy indicators: copy, copy(1), copy_2
-            r'[_\-\s]copy(?:[_\-\s]?\((\d+)\))?[_\-\s]?',
-            r'[_\-\s]copy[_\-\s]?(\d+)[_\-\s]?',
-            
-            # Final/backup indicators
-            r'[_\-\s](final|backup|old|new|latest|current)[_\-\s]?(\d+)?[_\-\s]?',
-            
-            # Date patterns: 20231201, 2023-12-01, 01122023
-            r'[_\-\s](\d{4})[_\-]?(\d{2})[_\-]?(\d{2})[_\-\s]?',
-            r'[_\-\s](\d{2})[_\-]?(\d{2})[_\-]?(\d{4})[_\-\s]?',
-            
-            # Timestamp patterns: 143000, 14-30-00
-            r'[_\-\s](\d{2})[_\-]?(\d{2})[_\-]?(\d{2})[_\-\s]?',
-            
-            # Parenthetical numbers: (1), (2), (copy)
-            r'\((\d+)\)',
-            r'\((copy|backup|final|old|new)\)',
-        ]
-        
-        # Compile patterns
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.version_patterns]
+        # Version patterns, compiled once per process at import
+        self.version_patterns = _VERSION_PATTERNS
+        self.compiled_patterns = _COMPILED_PATTERNS
+        self.combined_pattern = _COMBINED_PATTERN
+        self.trigger_pattern = _TRIGGER_PATTERN
+        self.separator_pattern = _SEPARATOR_PATTERN
         
         # Statistics
         self.documents_processed = 0
         self.version_groups_found = 0
         self.filename_comparisons = 0
+        
+        # Filename -> (stem, suffix); every helper works on stems, so each
+        # distinct filename is parsed with pathlib only once
+        self._filename_parts = {}
+        
+        # Modification date -> days since epoch; copies usually keep the
+        # original's timestamp, so versions often share the same date
+        self._epoch_days = {}
     
     def find_document_versions(self, documents: List[DocumentInfo]) -> Dict[str, Any]:
         """
@@ -105,21 +139,29 @@ class VersionDetector:
         """
         self.logger.info(f"Detecting versions for {len(documents)} documents")
         
+        # Parse every filename once up front
+        self._filename_parts = {}
+        self._epoch_days = {}
+        for doc in documents:
+            self._split_filename(doc.filename)
+        
         # Group documents by base filename (without version indicators)
         base_groups = self._group_by_base_filename(documents)
         
         # Find version groups
+        candidate_groups = [(base_name, docs) for base_name, docs in base_groups.items() if len(docs) > 1]
         version_groups = []
-        for base_name, docs in base_groups.items():
-            if len(docs) > 1:
-                # Analyze this group for versions
-                group_analysis = self._analyze_version_group(base_name, docs)
-                if group_analysis:
-                    version_groups.append(group_analysis)
-        
-        # Additional fuzzy matching for similar filenames
+        versioned_doc_ids = set()
+        for (base_name, docs), group_analysis in zip(candidate_groups, self._analyze_version_groups(candidate_groups)):
+            if group_analysis:
+                version_groups.append(group_analysis)
+                versioned_doc_ids.update(id(doc) for doc in docs)
+        
+        # Additional fuzzy matching for similar filenames; documents already
+        # reported in a version group are not matched again
         if self.enable_fuzzy_matching:
-            fuzzy_groups = self._find_fuzzy_filename_matches(documents)
+            unversioned_docs = [doc for doc in documents if id(doc) not in versioned_doc_ids]
+            fuzzy_groups = self._find_fuzzy_filename_matches(unversioned_docs)
             version_groups.extend(fuzzy_groups)
         
         self.version_groups_found = len(version_groups)
@@ -138,6 +180,19 @@ class VersionDetector:
         
         return results
     
+    def _split_filename(self, filename: str) -> Tuple[str, str]:
+        """Split a filename into (stem, suffix), cached per filename"""
+        parts = self._filename_parts.get(filename)
+        if parts is None:
+            path = Path(filename)
+            parts = self._filename_parts[filename] = (path.stem, path.suffix)
+        return parts
+    
+    def _has_version_indicator(self, name: str) -> bool:
+        """Check whether any version pattern matches the name"""
+        # Cheap literal prefilter first; most names carry no indicator at all
+        return bool(self.trigger_pattern.search(name) and self.combined_pattern.search(name))
+    
     def _group_by_base_filename(self, documents: List[DocumentInfo]) -> Dict[str, List[DocumentInfo]]:
         """Group documents by their base filename (removing version indicators)"""
         base_groups = defaultdict(list)
@@ -151,15 +206,19 @@ class VersionDetector:
     def _extract_base_filename(self, filename: str) -> str:
         """Extract base filename by removing version indicators"""
         # Remove file extension
-        name_without_ext = Path(filename).stem
+        name_without_ext = self._split_filename(filename)[0]
         
-        # Remove version patterns
+        # Remove version patterns (single scan when there is nothing to remove).
+        # The patterns are applied one after another rather than as one
+        # combined substitution: a match can consume the separator the next
+        # indicator needs ("report_final_v3" would leave "reportv3").
         base_name = name_without_ext
-        for pattern in self.compiled_patterns:
-            base_name = pattern.sub('', base_name)
+        if self._has_version_indicator(base_name):
+            for pattern in self.compiled_patterns:
+                base_name = pattern.sub('', base_name)
         
         # Clean up extra spaces, dashes, underscores
-        base_name = re.sub(r'[_\-\s]+', '_', base_name)
+        base_name = self.separator_pattern.sub('_', base_name)
         base_name = base_name.strip('_-')
         
         # If base name is empty or too short, use original
@@ -168,6 +227,19 @@ class VersionDetector:
         
         return base_name.lower()
     
+    def _analyze_version_groups(self, candidate_groups: List[Tuple[str, List[DocumentInfo]]]) -> List[Optional[Dict[str, Any]]]:
+        """Analyze candidate groups, in worker processes for large corpora"""
+        if self.threads <= 1 or len(candidate_groups) < self.parallel_threshold:
+            return [self._analyze_version_group(base_name, docs) for base_name, docs in candidate_groups]
+        
+        # Version extraction is CPU-bound regex work that holds the GIL, so
+        # use processes; each worker builds its own detector once (map
+        # preserves order)
+        with ProcessPoolExecutor(max_workers=self.threads,
+                                 initializer=_init_version_worker,
+                                 initargs=(self.config,)) as executor:
+            return list(executor.map(_analyze_version_group_in_worker, candidate_groups, chunksize=64))
+    
     def _analyze_version_group(self, base_name: str, documents: List[DocumentInfo]) -> Optional[Dict[str, Any]]:
         """Analyze a group of documents with the same base filename"""
         if len(documents) < 2:
@@ -179,8 +251,11 @@ class VersionDetector:
             info = self._extract_version_info(doc)
             version_info.append(info)
         
+        # Which indicator kinds occur in the group, reduced once per column
+        indicators_present = self._find_indicators_present(version_info)
+        
         # Check if this is actually a version group
-        if not self._is_valid_version_group(version_info):
+        if not self._is_valid_version_group(version_info, indicators_present):
             return None
         
         # Sort by version/date
@@ -188,16 +263,17 @@ class VersionDetector:
         
         # Create group analysis
         group = {
-            'group_id': f"ver_{hash(base_name) % 10000}",
+            # Stable across runs and worker processes, unlike the salted hash()
+            'group_id': f"ver_{hashlib.blake2b(base_name.encode('utf-8'), digest_size=6).hexdigest()}",
             'type': 'filename_versions',
             'base_name': base_name,
             'document_count': len(documents),
             'documents': [self._document_to_dict(info['document']) for info in sorted_versions],
             'version_analysis': {
-                'has_version_numbers': any(info['version_number'] for info in version_info),
-                'has_dates': any(info['date_info'] for info in version_info),
-                'has_copy_indicators': any(info['copy_indicator'] for info in version_info),
-                'version_pattern': self._identify_version_pattern(version_info),
+                'has_version_numbers': indicators_present['version_number'],
+                'has_dates': indicators_present['date_info'],
+                'has_copy_indicators': indicators_present['copy_indicator'],
+                'version_pattern': self._identify_version_pattern(indicators_present),
             },
             'timeline': self._create_version_timeline(sorted_versions),
         }
@@ -207,7 +283,7 @@ class VersionDetector:
     def _extract_version_info(self, document: DocumentInfo) -> Dict[str, Any]:
         """Extract version information from a document"""
         filename = document.filename
-        name_without_ext = Path(filename).stem
+        name_without_ext = self._split_filename(filename)[0]
         
         info = {
             'document': document,
@@ -222,9 +298,16 @@ class VersionDetector:
             'version_score': 0,  # Higher score = likely newer version
         }
         
+        # One scan with the fused pattern; only names with at least one
+        # indicator are matched pattern by pattern. Patterns can overlap
+        # (e.g. "copy" / "copy 3", or the date and timestamp patterns), so
+        # each still needs its own first match.
+        name_lower = name_without_ext.lower()
+        candidate_patterns = self.compiled_patterns if self._has_version_indicator(name_lower) else []
+        
         # Check each pattern
-        for i, pattern in enumerate(self.compiled_patterns):
-            matches = pattern.findall(name_without_ext.lower())
+        for i, pattern in enumerate(candidate_patterns):
+            matches = pattern.findall(name_lower)
             if matches:
                 match = matches[0] if isinstance(matches[0], str) else matches[0][0] if matches[0] else None
                 
@@ -264,12 +347,14 @@ class VersionDetector:
                     if isinstance(matches[0], tuple) and len(matches[0]) >= 3:
                         try:
                             year, month, day = matches[0][:3]
+                            # Month and day are always two digits, so parsing the
+                            # concatenated digits gives year * 10000 + month * 100 + day
                             if len(year) == 4:  # YYYY-MM-DD format
                                 info['date_info'] = f"{year}-{month}-{day}"
-                                info['version_score'] += int(year) * 10000 + int(month) * 100 + int(day)
+                                info['version_score'] += int(year + month + day)
                             else:  # DD-MM-YYYY format
                                 info['date_info'] = f"{matches[0][2]}-{month}-{year}"
-                                info['version_score'] += int(matches[0][2]) * 10000 + int(month) * 100 + int(year)
+                                info['version_score'] += int(matches[0][2] + month + year)
                         except (ValueError, IndexError):
                             pass
         
@@ -277,59 +362,59 @@ class VersionDetector:
         if document.modified_date:
             info['file_modified_date'] = document.modified_date
             # Add timestamp to version score (days since epoch)
-            info['version_score'] += document.modified_date.timestamp() / (24 * 3600)
+            epoch_days = self._epoch_days.get(document.modified_date)
+            if epoch_days is None:
+                epoch_days = self._epoch_days[document.modified_date] = document.modified_date.timestamp() / (24 * 3600)
+            info['version_score'] += epoch_days
         
         return info
     
-    def _is_valid_version_group(self, version_info: List[Dict[str, Any]]) -> bool:
+    def _find_indicators_present(self, version_info: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Check for each indicator field whether any version in the group has it"""
+        present = np.array(
+            [[bool(info[field]) for field in _INDICATOR_FIELDS] for info in version_info],
+            dtype=bool
+        ).reshape(len(version_info), len(_INDICATOR_FIELDS))
+        return dict(zip(_INDICATOR_FIELDS, present.any(axis=0).tolist()))
+    
+    def _is_valid_version_group(self, version_info: List[Dict[str, Any]],
+                                indicators_present: Dict[str, bool]) -> bool:
         """Check if a group of files represents valid versions"""
         # Must have at least one version indicator
-        has_version_indicators = any(
-            info['version_number'] or info['revision_number'] or 
-            info['copy_indicator'] or info['date_info'] or 
-            info['special_indicators']
-            for info in version_info
-        )
-        
-        if not has_version_indicators:
+        if not any(indicators_present.values()):
             return False
         
-        # Check if files have same extension
-        extensions = [Path(info['filename']).suffix for info in version_info]
-        same_extension = len(set(extensions)) == 1
+        # Check if files have same extension (cheap, so before the size math)
+        extensions = {self._split_filename(info['filename'])[1] for info in version_info}
+        if len(extensions) != 1:
+            return False
         
         # Check if files have similar sizes (within reasonable range)
-        sizes = [info['document'].size for info in version_info]
-        if sizes:
-            avg_size = sum(sizes) / len(sizes)
-            size_variance = sum((size - avg_size) ** 2 for size in sizes) / len(sizes)
-            reasonable_variance = size_variance < (avg_size * 0.5) ** 2  # 50% variance threshold
-        else:
-            reasonable_variance = True
-        
-        return same_extension and reasonable_variance
+        sizes = np.fromiter((info['document'].size for info in version_info), dtype=np.float64, count=len(version_info))
+        return bool(sizes.var() < (sizes.mean() * 0.5) ** 2)  # 50% variance threshold
     
     def _sort_versions(self, version_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sort versions by their version score (oldest to newest)"""
-        return sorted(version_info, key=lambda x: x['version_score'])
+        scores = np.fromiter((info['version_score'] for info in version_info), dtype=np.float64, count=len(version_info))
+        return [version_info[i] for i in np.argsort(scores, kind='stable')]
     
-    def _identify_version_pattern(self, version_info: List[Dict[str, Any]]) -> str:
+    def _identify_version_pattern(self, indicators_present: Dict[str, bool]) -> str:
         """Identify the versioning pattern used"""
         patterns = []
         
-        if any(info['version_number'] for info in version_info):
+        if indicators_present['version_number']:
             patterns.append('version_numbers')
         
-        if any(info['revision_number'] for info in version_info):
+        if indicators_present['revision_number']:
             patterns.append('revision_numbers')
         
-        if any(info['copy_indicator'] for info in version_info):
+        if indicators_present['copy_indicator']:
             patterns.append('copy_indicators')
         
-        if any(info['date_info'] for info in version_info):
+        if indicators_present['date_info']:
             patterns.append('date_stamps')
         
-        if any(info['special_indicators'] for info in version_info):
+        if indicators_present['special_indicators']:
             patterns.append('special_indicators')
         
         return ', '.join(patterns) if patterns else 'unknown'
@@ -373,30 +458,68 @@ class VersionDetector:
     
     def _find_fuzzy_filename_matches(self, documents: List[DocumentInfo]) -> List[Dict[str, Any]]:
         """Find documents with similar filenames using fuzzy matching"""
-        if not (DIFFLIB_AVAILABLE or FUZZYWUZZY_AVAILABLE):
+        if not RAPIDFUZZ_AVAILABLE:
             return []
         
-        fuzzy_groups = []
-        processed_docs = set()
-        
-        for i, doc1 in enumerate(documents):
-            if id(doc1) in processed_docs:
-                continue
-            
-            similar_docs = [doc1]
-            processed_docs.add(id(doc1))
-            
-            for j, doc2 in enumerate(documents[i+1:], i+1):
-                if id(doc2) in processed_docs:
+        threshold = self.filename_similarity_threshold
+        stems = [self._split_filename(doc.filename)[0].lower() for doc in documents]
+        
+        # Length prefilter: ratio = 2 * matches / (len_a + len_b), which for
+        # len_a <= len_b is at most 2 * len_a / (len_a + len_b). A pair can only
+        # reach the threshold if len_b <= len_a * (2 - T) / T, so with stems
+        # sorted by length each stem's candidates are a contiguous run.
+        order = sorted(range(len(stems)), key=lambda i: len(stems[i]))
+        sorted_stems = [stems[i] for i in order]
+        lengths = np.array([len(stem) for stem in sorted_stems], dtype=np.float64)
+        max_length_ratio = (2 - threshold) / threshold if threshold > 0 else np.inf
+        # (small slack so float rounding of the bound never drops a boundary pair)
+        candidate_end = np.searchsorted(lengths, lengths * max_length_ratio + 1e-9, side='right')
+        
+        # Union-find over matching pairs: groups are the connected components,
+        # so transitively similar filenames end up in the same group
+        parent = list(range(len(documents)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        # Score each block of rows against its candidate columns in one
+        # multithreaded C call; pairs below the threshold come back as 0.
+        # Scores are float32, so a score equal to the float32-rounded cutoff
+        # may be just below the cutoff; those pairs are rescored exactly
+        cutoff = threshold * 100
+        cutoff32 = np.float32(cutoff)
+        for block_start in range(0, len(sorted_stems), self.block_size):
+            block_end = min(block_start + self.block_size, len(sorted_stems))
+            column_end = int(candidate_end[block_end - 1])
+            scores = rapidfuzz_process.cdist(
+                sorted_stems[block_start:block_end],
+                sorted_stems[block_start:column_end],
+                scorer=rapidfuzz_fuzz.ratio,
+                score_cutoff=cutoff,
+                workers=-1,
+                dtype=np.float32,
+            )
+            rows, cols = np.nonzero(scores >= cutoff32)
+            on_cutoff = scores[rows, cols] == cutoff32
+            rows += block_start
+            cols += block_start
+            valid = (rows < cols) & (cols < candidate_end[rows])
+            for i, j, rescore in zip(rows[valid].tolist(), cols[valid].tolist(), on_cutoff[valid].tolist()):
+                if rescore and rapidfuzz_fuzz.ratio(sorted_stems[i], sorted_stems[j]) < cutoff:
                     continue
-                
-                similarity = self._calculate_filename_similarity(doc1.filename, doc2.filename)
-                self.filename_comparisons += 1
-                
-                if similarity >= self.filename_similarity_threshold:
-                    similar_docs.append(doc2)
-                    processed_docs.add(id(doc2))
-            
+                parent[find(order[j])] = find(order[i])
+        
+        self.filename_comparisons += int(np.sum(candidate_end - np.arange(len(sorted_stems)) - 1))
+        
+        components = defaultdict(list)
+        for i, doc in enumerate(documents):
+            components[find(i)].append(doc)
+        
+        fuzzy_groups = []
+        for similar_docs in components.values():
             if len(similar_docs) > 1:
                 # Create fuzzy group
                 group = {
@@ -410,39 +533,22 @@ class VersionDetector:
         
         return fuzzy_groups
     
-    def _calculate_filename_similarity(self, filename1: str, filename2: str) -> float:
-        """Calculate similarity between two filenames"""
-        # Remove extensions and normalize
-        name1 = Path(filename1).stem.lower()
-        name2 = Path(filename2).stem.lower()
-        
-        if FUZZYWUZZY_AVAILABLE:
-            # Use fuzzywuzzy for better fuzzy matching
-            return fuzz.ratio(name1, name2) / 100.0
-        elif DIFFLIB_AVAILABLE:
-            # Use difflib as fallback
-            return SequenceMatcher(None, name1, name2).ratio()
-        else:
-            # Simple character-based similarity
-            common_chars = set(name1) & set(name2)
-            total_chars = set(name1) | set(name2)
-            return len(common_chars) / len(total_chars) if total_chars else 0.0
+    def _filename_similarity_matrix(self, filenames: List[str]) -> np.ndarray:
+        """Calculate all pairwise filename similarities of a group as a matrix"""
+        stems = [self._split_filename(filename)[0].lower() for filename in filenames]
+        return rapidfuzz_process.cdist(stems, stems, scorer=rapidfuzz_fuzz.ratio, dtype=np.float64) / 100.0
     
     def _analyze_filename_similarities(self, documents: List[DocumentInfo]) -> Dict[str, Any]:
         """Analyze similarities between filenames in a group"""
         filenames = [doc.filename for doc in documents]
         
-        # Calculate pairwise similarities
-        similarities = []
-        for i, name1 in enumerate(filenames):
-            for name2 in filenames[i+1:]:
-                sim = self._calculate_filename_similarity(name1, name2)
-                similarities.append(sim)
+        # Calculate pairwise similarities (upper triangle of the group matrix)
+        similarities = self._filename_similarity_matrix(filenames)[np.triu_indices(len(filenames), k=1)]
         
         analysis = {
-            'avg_similarity': sum(similarities) / len(similarities) if similarities else 0.0,
-            'min_similarity': min(similarities) if similarities else 0.0,
-            'max_similarity': max(similarities) if similarities else 0.0,
+            'avg_similarity': float(similarities.mean()) if similarities.size else 0.0,
+            'min_similarity': float(similarities.min()) if similarities.size else 0.0,
+            'max_similarity': float(similarities.max()) if similarities.size else 0.0,
             'filename_lengths': [len(name) for name in filenames],
             'common_words': self._find_common_words(filenames),
         }
@@ -454,9 +560,9 @@ class VersionDetector:
         # Extract words from filenames
         all_words = []
         for filename in filenames:
-            name = Path(filename).stem.lower()
+            name = self._split_filename(filename)[0].lower()
             # Split on common separators
-            words = re.split(r'[_\-\s\.]+', name)
+            words = name.translate(_SEPARATOR_TABLE).split()
             all_words.extend([word for word in words if len(word) > 2])
         
         # Count word frequencies
@@ -548,4 +654,21 @@ class VersionDetector:
         self.documents_processed = 0
         self.version_groups_found = 0
         self.filename_comparisons = 0
+        self._filename_parts = {}
+        self._epoch_days = {}
+
+
+# Detector used by version-analysis worker processes
+_worker_detector = None
+
+
+def _init_version_worker(config: Optional[Any]) -> None:
+    """Create the per-process detector for parallel version analysis"""
+    global _worker_detector
+    _worker_detector = VersionDetector(config)
+
 
+def _analyze_version_group_in_worker(candidate_group: Tuple[str, List[DocumentInfo]]) -> Optional[Dict[str, Any]]:
+    """Analyze one candidate version group in a worker process"""
+    base_name, documents = candidate_group
+    return _worker_detector._analyze_version_group(base_name, documents)
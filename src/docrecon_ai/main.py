@@ -6,17 +6,20 @@ AI-powered document analysis and consolidation tool for enterprise environments.
 """
 
 import click
+import json
 import logging
+import mmap
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from .config import Config
 from .crawler.main import DocumentCrawler
-from .nlp.analyzer import NLPAnalyzer
-from .detection.main import DuplicateDetector
-from .reporting.main import ReportGenerator
+
+# NLPAnalyzer, DuplicateDetector and ReportGenerator are imported inside the
+# commands that use them, so other commands start without loading NLP models
 
 
 # Configure logging
@@ -26,6 +29,185 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Optional fast JSON encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional columnar document storage
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Columns of the Parquet document table, in DocumentInfo.to_dict() order
+DOCUMENT_COLUMNS = [
+    ('path', 'string'),
+    ('filename', 'string'),
+    ('size', 'int64'),
+    ('size_mb', 'float64'),
+    ('modified_date', 'timestamp'),
+    ('created_date', 'timestamp'),
+    ('file_extension', 'string'),
+    ('mime_type', 'string'),
+    ('encoding', 'string'),
+    ('sha256_hash', 'string'),
+    ('md5_hash', 'string'),
+    ('text_length', 'int64'),
+    ('metadata', 'json'),
+    ('source_type', 'string'),
+    ('source_url', 'string'),
+    ('processed', 'bool'),
+    ('error_message', 'string'),
+    ('is_text_file', 'bool'),
+    ('is_office_document', 'bool'),
+    ('is_pdf', 'bool'),
+]
+
+
+def _dump_json_bytes(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize a single JSON value to UTF-8 bytes (orjson if available)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _write_analysis_results(output_file: Path, documents: List[Any], sections: Dict[str, Any],
+                            pretty: bool = False) -> None:
+    """
+    Write analysis results as one JSON object without building it in memory.
+    
+    Documents are serialized one at a time (one per line inside the
+    'documents' array), followed by the remaining top-level sections.
+    The file is machine input for report/export, so it is written compact
+    unless pretty is set.
+    
+    Args:
+        output_file: Path of the JSON file to write
+        documents: Documents providing to_dict()
+        sections: Additional top-level keys (duplicate groups, statistics, ...)
+        pretty: Indent the output by two spaces per level for reading
+    """
+    def dump(obj: Any, level: int) -> bytes:
+        data = _dump_json_bytes(obj, pretty)
+        if pretty:
+            # Serialized JSON has no raw newlines inside strings, so nested
+            # values can be shifted to their level by indenting every line
+            data = data.replace(b'\n', b'\n' + b'  ' * level)
+        return data
+    
+    indent = b'  ' if pretty else b''
+    key_separator = b': ' if pretty else b':'
+    
+    with open(output_file, 'wb') as f:
+        f.write(b'{' + (b'\n' + indent if pretty else b'') + b'"documents"' + key_separator + b'[')
+        for i, doc in enumerate(documents):
+            f.write(b',\n' if i else b'\n')
+            f.write(indent * 2 + dump(doc.to_dict(), 2))
+        f.write(b'\n' + indent + b']')
+        
+        for key, value in sections.items():
+            f.write(b',\n' + indent + _dump_json_bytes(key) + key_separator)
+            f.write(dump(value, 1))
+        f.write(b'\n}\n')
+
+
+def _load_analysis_results(results_file: str) -> Dict[str, Any]:
+    """
+    Load an analysis results JSON file.
+    
+    With orjson the file is memory-mapped and parsed in place, so its
+    contents are never copied into a Python string first.
+    
+    Args:
+        results_file: Path of the analysis_results.json file
+        
+    Returns:
+        dict: Parsed analysis results
+    """
+    if ORJSON_AVAILABLE and os.path.getsize(results_file) > 0:
+        with open(results_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+    
+    with open(results_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _iter_duplicate_batches(duplicate_groups: List[Dict[str, Any]],
+                            batch_size: int = 10000) -> Iterator[Dict[str, List[Any]]]:
+    """
+    Flatten duplicate groups into batches of CSV export columns.
+    
+    Args:
+        duplicate_groups: Duplicate groups from the analysis results
+        batch_size: Maximum number of rows per batch
+        
+    Yields:
+        dict: group_id, filename, path and size columns; the last batch
+        may be empty
+    """
+    batch = {'group_id': [], 'filename': [], 'path': [], 'size': []}
+    for group in duplicate_groups:
+        group_id = group.get('group_id')
+        for doc in group.get('documents', []):
+            batch['group_id'].append(group_id)
+            batch['filename'].append(doc.get('filename'))
+            batch['path'].append(doc.get('path'))
+            batch['size'].append(doc.get('size'))
+            
+            if len(batch['path']) >= batch_size:
+                yield batch
+                batch = {'group_id': [], 'filename': [], 'path': [], 'size': []}
+    
+    yield batch
+
+
+def documents_to_arrow(documents: List[Any]) -> 'pa.Table':
+    """
+    Build a columnar Arrow table from documents in a single pass.
+    
+    Columns are transposed from DocumentInfo.to_tuple(), so no per-document
+    dict is created. The metadata dict is stored as a JSON string.
+    
+    Args:
+        documents: DocumentInfo objects
+        
+    Returns:
+        pa.Table: One row per document, columns as in DOCUMENT_COLUMNS
+    """
+    names = [name for name, _ in DOCUMENT_COLUMNS]
+    if documents:
+        columns = dict(zip(names, map(list, zip(*(doc.to_tuple() for doc in documents)))))
+    else:
+        columns = {name: [] for name in names}
+    columns['metadata'] = [
+        _dump_json_bytes(metadata).decode('utf-8') if metadata else None
+        for metadata in columns['metadata']
+    ]
+    
+    arrow_types = {
+        'string': pa.string(),
+        'json': pa.string(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('us'),
+    }
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in DOCUMENT_COLUMNS])
+    return pa.Table.from_pydict(columns, schema=schema)
+
 
 @click.group()
 @click.version_option(version="1.0.0")
@@ -70,8 +252,10 @@ def cli(ctx, config, log_level, log_file):
 @click.option('--file-types', multiple=True, help='File extensions to include (e.g., .pdf .docx)')
 @click.option('--sharepoint-site', help='Specific SharePoint site to crawl')
 @click.option('--parallel-workers', type=int, help='Number of parallel workers')
+@click.option('--pretty', is_flag=True, help='Indent analysis_results.json for reading (larger, slower)')
 @click.pass_context
-def analyze(ctx, paths, output, include_nlp, skip_similarity, max_files, file_types, sharepoint_site, parallel_workers):
+def analyze(ctx, paths, output, include_nlp, skip_similarity, max_files, file_types, sharepoint_site, parallel_workers,
+            pretty):
     """Analyze documents for duplicates and similarities."""
     
     config = ctx.obj
@@ -83,7 +267,10 @@ def analyze(ctx, paths, output, include_nlp, skip_similarity, max_files, file_ty
         if max_files:
             config.set('crawler.max_files', max_files)
         if file_types:
-            config.set('crawler.file_extensions', list(file_types))
+            # Normalized like DocumentInfo.file_extension, so crawlers can drop
+            # other files by name before they are stat'ed or hashed
+            extensions = [ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in file_types]
+            config.set('crawler.supported_extensions', extensions)
         if parallel_workers:
             config.set('crawler.parallel_workers', parallel_workers)
         
@@ -106,15 +293,17 @@ def analyze(ctx, paths, output, include_nlp, skip_similarity, max_files, file_ty
         
         logger.info(f"Found {len(documents)} documents")
         
-        # NLP Analysis
-        if include_nlp:
+        # NLP Analysis (models are only loaded when there is something to analyze)
+        if include_nlp and documents:
             logger.info("Performing NLP analysis...")
+            from .nlp.analyzer import NLPAnalyzer
             nlp_analyzer = NLPAnalyzer(config)
             documents = nlp_analyzer.analyze_documents(documents)
         
-        # Duplicate Detection
-        if not skip_similarity:
+        # Duplicate Detection (needs at least two documents to find anything)
+        if not skip_similarity and len(documents) > 1:
             logger.info("Detecting duplicates and similarities...")
+            from .detection.main import DuplicateDetector
             detector = DuplicateDetector(config)
             duplicate_groups, similar_groups = detector.detect_duplicates(documents)
         else:
@@ -122,6 +311,7 @@ def analyze(ctx, paths, output, include_nlp, skip_similarity, max_files, file_ty
         
         # Generate Reports
         logger.info("Generating reports...")
+        from .reporting.main import ReportGenerator
         report_generator = ReportGenerator(config)
         report_generator.generate_all_reports(
             documents=documents,
@@ -130,17 +320,16 @@ def analyze(ctx, paths, output, include_nlp, skip_similarity, max_files, file_ty
             output_dir=str(output_path)
         )
         
-        # Save analysis results
-        import json
-        results = {
-            'documents': [doc.to_dict() for doc in documents],
+        # Save analysis results (streamed, documents are never collected as dicts)
+        _write_analysis_results(output_path / 'analysis_results.json', documents, {
             'duplicate_groups': duplicate_groups,
             'similar_groups': similar_groups,
             'statistics': crawler.get_statistics()
-        }
+        }, pretty=pretty)
         
-        with open(output_path / 'analysis_results.json', 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+        # Columnar copy of the document table for fast loading in export
+        if PYARROW_AVAILABLE:
+            pq.write_table(documents_to_arrow(documents), output_path / 'documents.parquet', compression='zstd')
         
         logger.info(f"Analysis complete! Results saved to {output_path}")
         
@@ -257,14 +446,13 @@ def report(ctx, results_file, output, formats, title):
     
     try:
         # Load analysis results
-        import json
-        with open(results_file, 'r', encoding='utf-8') as f:
-            results = json.load(f)
+        results = _load_analysis_results(results_file)
         
         # Generate reports
+        from .reporting.main import ReportGenerator
         report_generator = ReportGenerator(config)
         
-        for format_type in formats:
+        def _emit(format_type):
             if format_type == 'html':
                 report_generator.generate_html_report(
                     documents=results['documents'],
@@ -287,6 +475,12 @@ def report(ctx, results_file, output, formats, title):
                     output_path=str(output_path / 'report.json')
                 )
         
+        # Formats are independent and mostly I/O, so write them concurrently
+        with ThreadPoolExecutor(max_workers=max(len(formats), 1)) as executor:
+            futures = [executor.submit(_emit, format_type) for format_type in formats]
+            for future in futures:
+                future.result()
+        
         logger.info(f"Reports generated in {output_path}")
         
     except Exception as e:
@@ -302,24 +496,20 @@ def dashboard(ctx, results, port):
     """Start interactive dashboard."""
     
     try:
-        import streamlit.web.cli as stcli
-        import sys
+        from streamlit.web import bootstrap
         
-        # Prepare streamlit arguments
         dashboard_script = Path(__file__).parent / 'dashboard' / 'main.py'
         
-        args = [
-            'streamlit', 'run', str(dashboard_script),
-            '--server.port', str(port),
-            '--server.headless', 'true'
-        ]
-        
-        if results:
-            args.extend(['--', '--results', results])
+        # Start the server directly with resolved options instead of
+        # rebuilding sys.argv and going through streamlit's CLI parser
+        flag_options = {
+            'server_port': port,
+            'server_headless': True
+        }
+        script_args = ['--results', results] if results else []
         
-        # Run streamlit
-        sys.argv = args
-        stcli.main()
+        bootstrap.load_config_options(flag_options=flag_options)
+        bootstrap.run(str(dashboard_script), False, script_args, flag_options)
         
     except ImportError:
         click.echo("❌ Streamlit not installed. Install with: pip install streamlit")
@@ -339,31 +529,45 @@ def export(ctx, results_file, export_format, output, component):
     """Export analysis data in various formats."""
     
     try:
+        # The document table can come from the Parquet file written next to
+        # the results, which avoids parsing the JSON results at all
+        parquet_file = Path(results_file).with_name('documents.parquet')
+        use_parquet = (export_format == 'csv' and component in (None, 'documents') and
+                       PYARROW_AVAILABLE and parquet_file.exists())
+        
         # Load analysis results
-        import json
-        with open(results_file, 'r', encoding='utf-8') as f:
-            results = json.load(f)
+        if not use_parquet:
+            results = _load_analysis_results(results_file)
         
         # Export data
         if export_format == 'csv':
             import pandas as pd
             
             if component == 'documents' or not component:
-                df = pd.DataFrame(results['documents'])
-                df.to_csv(output, index=False, encoding='utf-8')
+                if use_parquet:
+                    # Flat columns: Arrow's multithreaded writer, no pandas round trip
+                    pa_csv.write_csv(pq.read_table(parquet_file), output)
+                else:
+                    df = pd.DataFrame(results['documents'])
+                    df.to_csv(output, index=False, encoding='utf-8')
             elif component == 'duplicates':
-                # Flatten duplicate groups
-                duplicate_data = []
-                for group in results.get('duplicate_groups', []):
-                    for doc in group.get('documents', []):
-                        duplicate_data.append({
-                            'group_id': group.get('group_id'),
-                            'filename': doc.get('filename'),
-                            'path': doc.get('path'),
-                            'size': doc.get('size')
-                        })
-                df = pd.DataFrame(duplicate_data)
-                df.to_csv(output, index=False, encoding='utf-8')
+                # Stream the flattened duplicate groups in column batches,
+                # so all rows are never held in Python at once
+                batches = _iter_duplicate_batches(results.get('duplicate_groups', []))
+                if PYARROW_AVAILABLE:
+                    schema = pa.schema([
+                        ('group_id', pa.string()),
+                        ('filename', pa.string()),
+                        ('path', pa.string()),
+                        ('size', pa.int64()),
+                    ])
+                    with pa_csv.CSVWriter(output, schema) as writer:
+                        for batch in batches:
+                            writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+                else:
+                    for i, batch in enumerate(batches):
+                        df = pd.DataFrame(batch).astype({'size': 'Int64'})
+                        df.to_csv(output, mode='a' if i else 'w', header=not i, index=False, encoding='utf-8')
                 
         elif export_format == 'json':
             export_data = results
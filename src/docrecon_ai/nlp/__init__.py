@@ -9,11 +9,17 @@ This module provides NLP capabilities for document analysis:
 - Document clustering
 """
 
-from .extractor import TextExtractor
-from .embeddings import EmbeddingGenerator
-from .clustering import DocumentClusterer
-from .entities import EntityExtractor
-from .analyzer import NLPAnalyzer
+import importlib
+
+# Exports are imported on first access (PEP 562), so importing the package
+# does not load the embedding/NLP model libraries until they are used
+_LAZY_IMPORTS = {
+    "TextExtractor": ".extractor",
+    "EmbeddingGenerator": ".embeddings",
+    "DocumentClusterer": ".clustering",
+    "EntityExtractor": ".entities",
+    "NLPAnalyzer": ".analyzer",
+}
 
 __all__ = [
     "TextExtractor",
@@ -23,3 +29,14 @@ __all__ = [
     "NLPAnalyzer",
 ]
 
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
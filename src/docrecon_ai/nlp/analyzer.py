@@ -5,15 +5,23 @@ Provides a unified interface for text extraction, embedding generation,
 entity recognition, and document clustering.
 """
 
-from typing import List, Dict, Any, Optional, Iterator
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Callable
+import os
 import logging
-from pathlib import Path
+import threading
+import time
+from itertools import chain, islice
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
 
 from ..crawler.base import DocumentInfo
 from .extractor import TextExtractor
-from .embeddings import EmbeddingGenerator
+from .embeddings import EmbeddingGenerator, QueryEmbeddingBatcher
 from .clustering import DocumentClusterer
 from .entities import EntityExtractor
+from .text_store import TextStore
 
 logger = logging.getLogger(__name__)
 
@@ -51,40 +59,84 @@ class NLPAnalyzer:
         self.enable_clustering = getattr(config.nlp, 'enable_clustering', True) if config else True
         self.enable_entities = getattr(config.nlp, 'enable_entities', True) if config else True
         self.enable_keywords = getattr(config.nlp, 'enable_keywords', True) if config else True
-        
-        # Results storage
-        self.document_texts = {}
+        self.extraction_workers = (getattr(config.nlp, 'extraction_workers', None) if config else None) or os.cpu_count() or 1
+        self.parallel_extraction_threshold = 16  # Fewer documents are not worth starting processes
+        self.stream_chunk_size = 256  # Documents pulled from the input iterable at a time
+        self.entity_workers = (getattr(config.nlp, 'entity_workers', None) if config else None) or 8
+        self.entity_queue_size = 4 * self.entity_workers  # Texts waiting for entity extraction at most
+        self.embedding_chunk_size = 1024  # Texts read back from the text store per embedding call
+        self.text_preview_length = 200  # Characters of each text kept on its DocumentInfo
+        self.embedding_save_interval = 256  # analyze_single_document embeddings per disk cache write
+        
+        # Results storage (extracted texts are kept on disk, not in memory)
+        self.text_store_dir = getattr(config, 'temp_dir', None) if config else None
+        self.document_texts = self._create_text_store()
         self.document_embeddings = {}
         self.document_entities = {}
         self.document_keywords = {}
         self.cluster_results = {}
         
+        # document_embeddings stacked into one matrix (row i belongs to
+        # _embedding_ids[i]) and the similarity index over it; both are
+        # rebuilt on next use after embeddings change
+        self._embedding_ids = []
+        self._embedding_matrix = None
+        self._similarity_index = None
+        
+        # find_similar_documents may be called from many threads at once;
+        # this lock guards the embedding matrix, similarity index and query cache
+        self._search_lock = threading.RLock()
+        
+        # Recent find_similar_documents results; a query whose embedding is
+        # nearly identical to a cached one reuses its results
+        self.query_cache_size = 256
+        self.query_cache_ttl = 300.0  # seconds
+        self.query_cache_similarity = 0.95
+        self._query_cache = OrderedDict()  # (query, top_k, threshold) -> (embedding, results, timestamp)
+        
+        # Query embeddings from concurrent find_similar_documents calls are
+        # computed together in one model call per batch
+        self._query_embedder = QueryEmbeddingBatcher(self.embedding_generator.embed_texts)
+        
+        # Embeddings from analyze_single_document not yet written to the disk cache
+        self._unsaved_single_embeddings = 0
+        
         # Statistics
         self.documents_processed = 0
         self.processing_errors = 0
     
-    def analyze_documents(self, documents: List[DocumentInfo], 
+    def analyze_documents(self, documents: Iterable[DocumentInfo], 
                          extract_text: bool = True,
                          generate_embeddings: bool = True,
                          extract_entities: bool = True,
-                         cluster_documents: bool = True) -> Dict[str, Any]:
+                         cluster_documents: bool = True,
+                         on_chunk_complete: Optional[Callable[[List[DocumentInfo]], None]] = None) -> Dict[str, Any]:
         """
-        Perform comprehensive NLP analysis on a list of documents.
+        Perform comprehensive NLP analysis on a list or stream of documents.
+        
+        Documents are consumed in chunks of stream_chunk_size, so a crawler
+        generator can be passed directly and text extraction starts with the
+        first chunk instead of after the whole crawl.
         
         Args:
-            documents: List of DocumentInfo objects to analyze
+            documents: Iterable of DocumentInfo objects to analyze
             extract_text: Whether to extract text content
             generate_embeddings: Whether to generate embeddings
             extract_entities: Whether to extract entities and keywords
             cluster_documents: Whether to cluster documents
+            on_chunk_complete: Called with each chunk of documents once their
+                text has been extracted
             
         Returns:
             dict: Complete analysis results
         """
-        self.logger.info(f"Starting NLP analysis of {len(documents)} documents")
+        if hasattr(documents, '__len__'):
+            self.logger.info(f"Starting NLP analysis of {len(documents)} documents")
+        else:
+            self.logger.info("Starting NLP analysis of streamed documents")
         
         results = {
-            'documents_analyzed': len(documents),
+            'documents_analyzed': 0,
             'text_extraction': {},
             'embeddings': {},
             'entities': {},
@@ -93,24 +145,58 @@ class NLPAnalyzer:
             'statistics': {},
         }
         
-        # Step 1: Extract text content
-        if extract_text and self.enable_text_extraction:
-            self.logger.info("Extracting text content...")
-            text_results = self._extract_text_from_documents(documents)
-            results['text_extraction'] = text_results
-        
-        # Step 2: Generate embeddings
-        if generate_embeddings and self.enable_embeddings:
-            self.logger.info("Generating embeddings...")
-            embedding_results = self._generate_document_embeddings()
-            results['embeddings'] = embedding_results
-        
-        # Step 3: Extract entities and keywords
-        if extract_entities and (self.enable_entities or self.enable_keywords):
-            self.logger.info("Extracting entities and keywords...")
-            entity_results = self._extract_entities_and_keywords()
-            results['entities'] = entity_results['entities']
-            results['keywords'] = entity_results['keywords']
+        run_entities = extract_entities and (self.enable_entities or self.enable_keywords)
+        
+        # Entity extraction runs alongside the other steps: each text is
+        # handed to the entity threads as soon as it has been extracted,
+        # while the remaining files are parsed and embeddings are generated
+        with ThreadPoolExecutor(max_workers=max(1, self.entity_workers)) as entity_executor:
+            entity_futures = {}
+            
+            # Queued tasks hold their full text in memory, so at most
+            # entity_queue_size are pending; submitting waits for a free slot
+            pending_slots = threading.BoundedSemaphore(max(1, self.entity_queue_size))
+            
+            def submit_entities(doc_id: str, text: str):
+                pending_slots.acquire()
+                try:
+                    future = entity_executor.submit(self.entity_extractor.extract_entities_and_keywords, text)
+                except BaseException:
+                    pending_slots.release()
+                    raise
+                future.add_done_callback(lambda _: pending_slots.release())
+                entity_futures[doc_id] = future
+            
+            # Step 1: Extract text content
+            if extract_text and self.enable_text_extraction:
+                self.logger.info("Extracting text content...")
+                text_results = self._extract_text_from_documents(
+                    documents, on_text=submit_entities if run_entities else None,
+                    on_chunk_complete=on_chunk_complete
+                )
+                results['text_extraction'] = text_results
+                results['documents_analyzed'] = text_results['successful_extractions'] + text_results['failed_extractions']
+            else:
+                for chunk in _chunked(documents, self.stream_chunk_size):
+                    results['documents_analyzed'] += len(chunk)
+                    if on_chunk_complete:
+                        on_chunk_complete(chunk)
+            
+            # Step 2: Generate embeddings (needs all texts, e.g. to fit TF-IDF)
+            if generate_embeddings and self.enable_embeddings:
+                self.logger.info("Generating embeddings...")
+                embedding_results = self._generate_document_embeddings()
+                results['embeddings'] = embedding_results
+            
+            # Step 3: Extract entities and keywords
+            if run_entities:
+                self.logger.info("Extracting entities and keywords...")
+                for doc_id in self.document_texts:
+                    if doc_id not in entity_futures:
+                        submit_entities(doc_id, self.document_texts[doc_id])
+                entity_results = self._extract_entities_and_keywords(entity_futures)
+                results['entities'] = entity_results['entities']
+                results['keywords'] = entity_results['keywords']
         
         # Step 4: Cluster documents
         if cluster_documents and self.enable_clustering and self.document_embeddings:
@@ -158,20 +244,29 @@ class NLPAnalyzer:
                     result['text_length'] = text_result['length']
                     self.document_texts[doc_id] = text_result['text']
                     
-                    # Update document info
-                    document.text_content = text_result['text']
+                    # Update document info (full text stays in document_texts)
+                    document.text_content = text_result['text'][:self.text_preview_length]
                     document.text_length = text_result['length']
                 else:
                     result['error'] = text_result.get('error', 'Text extraction failed')
             
             # Generate embedding
             if self.enable_embeddings and result['text_content']:
+                # Written to the disk cache every embedding_save_interval
+                # documents (and on reset_analysis), not once per document
                 embeddings = self.embedding_generator.generate_embeddings(
-                    [result['text_content']], [doc_id]
+                    [result['text_content']], [doc_id], save_cache=False
                 )
+                self._unsaved_single_embeddings += 1
+                if self._unsaved_single_embeddings >= self.embedding_save_interval:
+                    self.embedding_generator.save_embedding_cache()
+                    self._unsaved_single_embeddings = 0
                 if doc_id in embeddings:
                     result['embedding'] = embeddings[doc_id]
-                    self.document_embeddings[doc_id] = embeddings[doc_id]
+                    self.document_embeddings.update(
+                        self.embedding_generator.normalize_embeddings({doc_id: embeddings[doc_id]})
+                    )
+                    self._invalidate_similarity_index()
             
             # Extract entities and keywords
             if (self.enable_entities or self.enable_keywords) and result['text_content']:
@@ -194,8 +289,13 @@ class NLPAnalyzer:
         
         return result
     
-    def _extract_text_from_documents(self, documents: List[DocumentInfo]) -> Dict[str, Any]:
-        """Extract text from all documents"""
+    def _extract_text_from_documents(self, documents: Iterable[DocumentInfo],
+                                     on_text: Optional[Callable[[str, str], None]] = None,
+                                     on_chunk_complete: Optional[Callable[[List[DocumentInfo]], None]] = None) -> Dict[str, Any]:
+        """
+        Extract text from all documents chunk by chunk, passing each extracted
+        text to on_text(doc_id, text) and each finished chunk to on_chunk_complete
+        """
         results = {
             'successful_extractions': 0,
             'failed_extractions': 0,
@@ -204,38 +304,76 @@ class NLPAnalyzer:
             'errors': [],
         }
         
-        for document in documents:
-            doc_id = self._get_document_id(document)
-            
-            try:
-                text_result = self.text_extractor.extract_text(document.path, document.file_extension)
+        for chunk, text_results in self._extract_text_chunks(documents):
+            for document, text_result in zip(chunk, text_results):
+                self._store_text_result(document, text_result, results, on_text)
+            if on_chunk_complete:
+                on_chunk_complete(chunk)
+        
+        return results
+    
+    def _store_text_result(self, document: DocumentInfo, text_result: Dict[str, Any],
+                           results: Dict[str, Any], on_text: Optional[Callable[[str, str], None]] = None):
+        """Record one extraction result on the document, in document_texts and in results"""
+        try:
+            if text_result['success']:
+                doc_id = self._get_document_id(document)
+                self.document_texts[doc_id] = text_result['text']
+                if on_text:
+                    on_text(doc_id, text_result['text'])
                 
-                if text_result['success']:
-                    self.document_texts[doc_id] = text_result['text']
-                    
-                    # Update document info
-                    document.text_content = text_result['text']
-                    document.text_length = text_result['length']
-                    
-                    # Update statistics
-                    results['successful_extractions'] += 1
-                    results['total_text_length'] += text_result['length']
-                    
-                    method = text_result.get('extraction_method', 'unknown')
-                    results['extraction_methods'][method] = results['extraction_methods'].get(method, 0) + 1
-                    
-                else:
-                    results['failed_extractions'] += 1
-                    error_msg = f"{document.filename}: {text_result.get('error', 'Unknown error')}"
-                    results['errors'].append(error_msg)
-                    
-            except Exception as e:
+                # Update document info; only a preview is kept in memory, the
+                # full text is read back from document_texts when needed
+                document.text_content = text_result['text'][:self.text_preview_length]
+                document.text_length = text_result['length']
+                
+                # Update statistics
+                results['successful_extractions'] += 1
+                results['total_text_length'] += text_result['length']
+                
+                method = text_result.get('extraction_method', 'unknown')
+                results['extraction_methods'][method] = results['extraction_methods'].get(method, 0) + 1
+                
+            else:
                 results['failed_extractions'] += 1
-                error_msg = f"{document.filename}: {str(e)}"
+                error_msg = f"{document.filename}: {text_result.get('error', 'Unknown error')}"
                 results['errors'].append(error_msg)
-                self.logger.error(f"Error extracting text from {document.filename}: {e}")
-        
-        return results
+                
+        except Exception as e:
+            results['failed_extractions'] += 1
+            error_msg = f"{document.filename}: {str(e)}"
+            results['errors'].append(error_msg)
+            self.logger.error(f"Error extracting text from {document.filename}: {e}")
+    
+    def _extract_text_chunks(self, documents: Iterable[DocumentInfo]) -> Iterator[Tuple[List[DocumentInfo], List[Dict[str, Any]]]]:
+        """Yield (chunk, text results) in document order, in worker processes for larger inputs"""
+        chunks = _chunked(documents, self.stream_chunk_size)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return
+        
+        if self.extraction_workers <= 1 or len(first_chunk) < self.parallel_extraction_threshold:
+            for chunk in chain([first_chunk], chunks):
+                yield chunk, [self.text_extractor.extract_text(document.path, document.file_extension)
+                              for document in chunk]
+            return
+        
+        # Parsing PDFs and Office files is CPU-bound and holds the GIL, so
+        # use processes; one pool serves every chunk, each worker builds its
+        # own extractor once and its statistics are added to ours as results
+        # come back (map keeps order)
+        with ProcessPoolExecutor(max_workers=self.extraction_workers,
+                                 initializer=_init_extraction_worker,
+                                 initargs=(self.config,)) as executor:
+            for chunk in chain([first_chunk], chunks):
+                paths = [document.path for document in chunk]
+                extensions = [document.file_extension for document in chunk]
+                text_results = []
+                for text_result, processed, errors in executor.map(_extract_text_in_worker, paths, extensions, chunksize=8):
+                    self.text_extractor.files_processed += processed
+                    self.text_extractor.extraction_errors += errors
+                    text_results.append(text_result)
+                yield chunk, text_results
     
     def _generate_document_embeddings(self) -> Dict[str, Any]:
         """Generate embeddings for all documents with text"""
@@ -250,12 +388,24 @@ class NLPAnalyzer:
             return results
         
         try:
-            # Generate embeddings
-            texts = list(self.document_texts.values())
-            doc_ids = list(self.document_texts.keys())
+            # Fit the model on all texts first if it needs to (TF-IDF), streaming
+            # them from the text store
+            self.embedding_generator.fit(self.document_texts.values())
             
-            embeddings = self.embedding_generator.generate_embeddings(texts, doc_ids)
-            self.document_embeddings.update(embeddings)
+            # Texts are read back in chunks of embedding_chunk_size, so only
+            # one chunk of them is in memory at a time. Embeddings are stored
+            # as unit vectors (normalised once here), so similarity search is
+            # a plain dot product over the stacked matrix. New embeddings are
+            # written to the disk cache once, after the last chunk
+            try:
+                for doc_ids in _chunked(self.document_texts.keys(), self.embedding_chunk_size):
+                    texts = [self.document_texts[doc_id] for doc_id in doc_ids]
+                    embeddings = self.embedding_generator.generate_embeddings(texts, doc_ids, save_cache=False)
+                    self.document_embeddings.update(self.embedding_generator.normalize_embeddings(embeddings))
+            finally:
+                self.embedding_generator.save_embedding_cache()
+                self._unsaved_single_embeddings = 0
+            self._invalidate_similarity_index()
             
             # Update statistics
             stats = self.embedding_generator.get_statistics()
@@ -271,8 +421,14 @@ class NLPAnalyzer:
         
         return results
     
-    def _extract_entities_and_keywords(self) -> Dict[str, Any]:
-        """Extract entities and keywords from all documents"""
+    def _extract_entities_and_keywords(self, entity_futures: Optional[Dict[str, Future]] = None) -> Dict[str, Any]:
+        """
+        Extract entities and keywords from all documents.
+        
+        Args:
+            entity_futures: Already submitted extractions per document ID;
+                all documents are extracted here if not given
+        """
         results = {
             'entities': {},
             'keywords': {},
@@ -280,12 +436,26 @@ class NLPAnalyzer:
             'keyword_summary': {},
         }
         
-        all_entities = {}
+        # Aggregates per entity type, keyed by entity text
+        entity_counts = defaultdict(Counter)
+        entity_documents = defaultdict(lambda: defaultdict(list))  # ascending indices into doc_ids
+        entity_confidence = defaultdict(dict)
         all_keywords = []
         
-        for doc_id, text in self.document_texts.items():
+        # spaCy and the regex/sklearn keyword code spend most of their time
+        # in C, so threads overlap well; results are aggregated here in
+        # document order, so the aggregation needs no locking
+        doc_ids = list(self.document_texts.keys())
+        if entity_futures is None:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.entity_workers, len(doc_ids)))) as executor:
+                entity_futures = {
+                    doc_id: executor.submit(self.entity_extractor.extract_entities_and_keywords, self.document_texts[doc_id])
+                    for doc_id in doc_ids
+                }
+        
+        for doc_index, doc_id in enumerate(doc_ids):
             try:
-                entity_result = self.entity_extractor.extract_entities_and_keywords(text)
+                entity_result = entity_futures[doc_id].result()
                 
                 # Store per-document results
                 self.document_entities[doc_id] = entity_result['entities']
@@ -293,20 +463,20 @@ class NLPAnalyzer:
                 
                 # Aggregate entities
                 for entity_type, entities in entity_result['entities'].items():
-                    if entity_type not in all_entities:
-                        all_entities[entity_type] = {}
+                    counts = entity_counts[entity_type]
+                    documents = entity_documents[entity_type]
+                    confidence = entity_confidence[entity_type]
                     
                     for entity in entities:
                         entity_text = entity['text']
-                        if entity_text in all_entities[entity_type]:
-                            all_entities[entity_type][entity_text]['count'] += entity['count']
-                            all_entities[entity_type][entity_text]['documents'].add(doc_id)
-                        else:
-                            all_entities[entity_type][entity_text] = {
-                                'count': entity['count'],
-                                'documents': {doc_id},
-                                'confidence': entity.get('confidence', 1.0)
-                            }
+                        counts[entity_text] += entity['count']
+                        # Documents are visited in order, so a repeat within
+                        # this document can only be the last index appended
+                        entity_doc_indices = documents[entity_text]
+                        if not entity_doc_indices or entity_doc_indices[-1] != doc_index:
+                            entity_doc_indices.append(doc_index)
+                        if entity_text not in confidence:
+                            confidence[entity_text] = entity.get('confidence', 1.0)
                 
                 # Aggregate keywords
                 all_keywords.extend(entity_result['keywords'])
@@ -316,51 +486,52 @@ class NLPAnalyzer:
         
         # Process aggregated entities
         processed_entities = {}
-        for entity_type, entities in all_entities.items():
-            processed_entities[entity_type] = []
-            for entity_text, entity_data in entities.items():
-                processed_entities[entity_type].append({
-                    'text': entity_text,
-                    'count': entity_data['count'],
-                    'document_count': len(entity_data['documents']),
-                    'documents': list(entity_data['documents']),
-                    'confidence': entity_data['confidence']
-                })
-            
-            # Sort by count
-            processed_entities[entity_type].sort(key=lambda x: x['count'], reverse=True)
+        for entity_type, counts in entity_counts.items():
+            documents = entity_documents[entity_type]
+            confidence = entity_confidence[entity_type]
+            # Order by count (stable, in C), then build the entries in that order
+            entity_texts = list(counts.keys())
+            count_array = np.fromiter(counts.values(), dtype=np.int64, count=len(entity_texts))
+            order = np.argsort(-count_array, kind='stable')
+            processed_entities[entity_type] = [
+                {
+                    'text': entity_texts[i],
+                    'count': int(count_array[i]),
+                    'document_count': len(documents[entity_texts[i]]),
+                    'documents': [doc_ids[doc_index] for doc_index in documents[entity_texts[i]]],
+                    'confidence': confidence[entity_texts[i]]
+                }
+                for i in order.tolist()
+            ]
         
         results['entities'] = processed_entities
         results['entity_summary'] = self.entity_extractor.get_entity_summary(processed_entities)
         
-        # Process aggregated keywords
-        keyword_counts = {}
+        # Process aggregated keywords (occurrences counted in C by Counter;
+        # methods are taken from a word's first occurrence)
+        keyword_occurrences = Counter(kw['word'] for kw in all_keywords)
+        keyword_scores = dict.fromkeys(keyword_occurrences, 0.0)
+        keyword_methods = {}
         for kw in all_keywords:
             word = kw['word']
-            if word in keyword_counts:
-                keyword_counts[word]['total_score'] += kw['score']
-                keyword_counts[word]['count'] += 1
-            else:
-                keyword_counts[word] = {
-                    'total_score': kw['score'],
-                    'count': 1,
-                    'methods': {kw.get('method', 'unknown')}
-                }
+            keyword_scores[word] += kw['score']
+            if word not in keyword_methods:
+                keyword_methods[word] = kw.get('method', 'unknown')
         
         # Create final keyword list
-        final_keywords = []
-        for word, data in keyword_counts.items():
-            avg_score = data['total_score'] / data['count']
-            final_keywords.append({
+        final_keywords = [
+            {
                 'word': word,
-                'avg_score': avg_score,
-                'document_count': data['count'],
-                'methods': list(data['methods'])
-            })
+                'avg_score': keyword_scores[word] / count,
+                'document_count': count,
+                'methods': [keyword_methods[word]]
+            }
+            for word, count in keyword_occurrences.items()
+        ]
         
-        # Sort by average score
-        final_keywords.sort(key=lambda x: x['avg_score'], reverse=True)
-        results['keywords'] = final_keywords[:50]  # Top 50 keywords
+        # Top 50 keywords by average score, without sorting the whole list
+        scores = np.fromiter((kw['avg_score'] for kw in final_keywords), dtype=np.float64, count=len(final_keywords))
+        results['keywords'] = [final_keywords[i] for i in _top_k_indices(scores, 50).tolist()]
         
         return results
     
@@ -372,19 +543,20 @@ class NLPAnalyzer:
             return results
         
         try:
-            # Perform clustering
-            cluster_result = self.document_clusterer.cluster_documents(
-                self.document_embeddings, method=method
+            # Perform clustering on the shared embedding matrix
+            doc_ids, embedding_matrix = self._get_embedding_matrix()
+            cluster_result = self.document_clusterer.cluster_embedding_matrix(
+                doc_ids, embedding_matrix, method=method
             )
             
             # Get cluster summary
-            document_info = {}
-            for doc_id in self.document_embeddings.keys():
-                # Find corresponding document
-                document_info[doc_id] = {
+            document_info = {
+                doc_id: {
                     'filename': doc_id,  # Simplified for now
-                    'text_length': len(self.document_texts.get(doc_id, '')),
+                    'text_length': self.document_texts.text_length(doc_id),
                 }
+                for doc_id in doc_ids
+            }
             
             cluster_summary = self.document_clusterer.get_cluster_summary(
                 cluster_result, document_info
@@ -427,19 +599,28 @@ class NLPAnalyzer:
             return []
         
         try:
-            # Generate embedding for query
-            query_embeddings = self.embedding_generator.generate_embeddings(
-                [query_text], ["query"]
-            )
+            # Exact repeat of a recent query
+            cache_key = (query_text, top_k, threshold)
+            cached = self._get_cached_query(cache_key)
+            if cached is not None:
+                return cached
             
-            if "query" not in query_embeddings:
-                return []
+            # Generate embedding for query (batched with concurrent queries,
+            # not stored in the document embedding cache)
+            query_embedding = np.asarray(self._query_embedder.embed(query_text), dtype=np.float32)
+            query_norm = np.linalg.norm(query_embedding)
+            if query_norm > 0:
+                query_embedding = query_embedding / query_norm
             
-            query_embedding = query_embeddings["query"]
+            # Near-duplicate of a recent query
+            cached = self._find_similar_cached_query(query_embedding, top_k, threshold)
+            if cached is not None:
+                return cached
             
-            # Find similar documents
-            similar_docs = self.embedding_generator.find_similar_documents(
-                query_embedding, self.document_embeddings, threshold, top_k
+            # Find similar documents (faiss or one matrix-vector product over all documents)
+            doc_ids, similarity_index = self._get_similarity_index()
+            similar_docs = self.embedding_generator.search_similarity_index(
+                query_embedding, doc_ids, similarity_index, threshold, top_k
             )
             
             # Add document information
@@ -448,7 +629,7 @@ class NLPAnalyzer:
                 result = {
                     'document_id': doc_id,
                     'similarity': similarity,
-                    'text_preview': self.document_texts.get(doc_id, '')[:200] + '...',
+                    'text_preview': self.document_texts.read_prefix(doc_id, 200) + '...',
                 }
                 
                 # Add entities and keywords if available
@@ -459,19 +640,110 @@ class NLPAnalyzer:
                 
                 results.append(result)
             
-            return results
+            self._cache_query(cache_key, query_embedding, results, similarity_index)
+            return [dict(result) for result in results]
             
         except Exception as e:
             self.logger.error(f"Error finding similar documents: {e}")
             return []
     
+    def _get_cached_query(self, cache_key: tuple) -> Optional[List[Dict[str, Any]]]:
+        """Get results of an identical recent query"""
+        with self._search_lock:
+            entry = self._query_cache.get(cache_key)
+            if entry is None or time.monotonic() - entry[2] > self.query_cache_ttl:
+                return None
+            
+            self._query_cache.move_to_end(cache_key)
+            return [dict(result) for result in entry[1]]
+    
+    def _find_similar_cached_query(self, query_embedding: np.ndarray, top_k: int,
+                                   threshold: float) -> Optional[List[Dict[str, Any]]]:
+        """Get results of a recent query with a nearly identical embedding"""
+        with self._search_lock:
+            now = time.monotonic()
+            entries = [
+                (key, entry) for key, entry in self._query_cache.items()
+                if key[1:] == (top_k, threshold) and now - entry[2] <= self.query_cache_ttl
+                and entry[0].shape == query_embedding.shape
+            ]
+            if not entries:
+                return None
+            
+            similarities = np.stack([entry[0] for _, entry in entries]) @ query_embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.query_cache_similarity:
+                return None
+            
+            key, entry = entries[best]
+            self._query_cache.move_to_end(key)
+            return [dict(result) for result in entry[1]]
+    
+    def _cache_query(self, cache_key: tuple, query_embedding: np.ndarray, results: List[Dict[str, Any]],
+                     similarity_index: Any):
+        """
+        Store query results, evicting the least recently used entries.
+        
+        Results found with a similarity index that has since been replaced
+        (embeddings changed during the search) are not stored.
+        """
+        with self._search_lock:
+            if similarity_index is not self._similarity_index:
+                return
+            
+            self._query_cache[cache_key] = (query_embedding, results, time.monotonic())
+            self._query_cache.move_to_end(cache_key)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+    
+    def _get_embedding_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Document IDs and embedding matrix (one row per ID) of document_embeddings"""
+        with self._search_lock:
+            if self._embedding_matrix is None:
+                self._embedding_ids = list(self.document_embeddings.keys())
+                self._embedding_matrix = np.stack([
+                    np.asarray(self.document_embeddings[doc_id]).ravel() for doc_id in self._embedding_ids
+                ]) if self._embedding_ids else np.empty((0, 0))
+            
+            return self._embedding_ids, self._embedding_matrix
+    
+    def _get_similarity_index(self) -> Tuple[List[str], Any]:
+        """Document IDs and similarity index over them, built on first use, read as one snapshot"""
+        with self._search_lock:
+            doc_ids, embedding_matrix = self._get_embedding_matrix()
+            if self._similarity_index is None:
+                self._similarity_index = self.embedding_generator.build_similarity_index_from_matrix(
+                    embedding_matrix, normalized=True
+                )
+            
+            return doc_ids, self._similarity_index
+    
+    def _invalidate_similarity_index(self):
+        """Drop the embedding matrix, similarity index and cached query results after embeddings change"""
+        with self._search_lock:
+            self._embedding_matrix = None
+            self._similarity_index = None
+            self._query_cache.clear()
+    
     def _get_document_id(self, document: DocumentInfo) -> str:
         """Generate a unique ID for a document"""
         # Use hash of path as ID, or filename if path not available
         if document.sha256_hash:
             return document.sha256_hash[:16]  # Use first 16 chars of hash
         else:
-            return f"{Path(document.path).stem}_{document.size}"
+            # File stem via os.path, cheaper than building a Path object
+            stem = os.path.splitext(os.path.basename(document.path))[0]
+            return f"{stem}_{document.size}"
+    
+    def _create_text_store(self) -> TextStore:
+        """Create the disk-backed store for extracted texts"""
+        if self.text_store_dir:
+            try:
+                os.makedirs(self.text_store_dir, exist_ok=True)
+                return TextStore(self.text_store_dir)
+            except OSError as e:
+                self.logger.warning(f"Cannot use {self.text_store_dir} for extracted texts, using system temp dir: {e}")
+        return TextStore()
     
     def _get_analysis_statistics(self) -> Dict[str, Any]:
         """Get comprehensive analysis statistics"""
@@ -503,11 +775,20 @@ class NLPAnalyzer:
     
     def reset_analysis(self):
         """Reset all analysis data and statistics"""
-        self.document_texts = {}
+        # Embeddings of analyze_single_document calls not yet written to the disk cache
+        self.embedding_generator.save_embedding_cache()
+        self._unsaved_single_embeddings = 0
+        self.document_texts.close()
+        self.document_texts = self._create_text_store()
         self.document_embeddings = {}
         self.document_entities = {}
         self.document_keywords = {}
         self.cluster_results = {}
+        with self._search_lock:
+            self._embedding_ids = []
+            self._embedding_matrix = None
+            self._similarity_index = None
+            self._query_cache.clear()
         
         self.documents_processed = 0
         self.processing_errors = 0
@@ -518,3 +799,49 @@ class NLPAnalyzer:
         self.document_clusterer.reset_statistics()
         self.entity_extractor.reset_statistics()
 
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, in the order a stable descending sort
+    would give them (ties keep their original order)
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        # Keep everything at least as high as the k-th highest score, so
+        # ties at the boundary are resolved by position like sort() does
+        kth_score = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth_score)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:k]
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items, pulling lazily from items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Per-process extractor for parallel text extraction
+_worker_extractor = None
+
+
+def _init_extraction_worker(config: Optional[Any]) -> None:
+    """Create the per-process text extractor for parallel extraction"""
+    global _worker_extractor
+    _worker_extractor = TextExtractor(config)
+
+
+def _extract_text_in_worker(file_path: str, file_extension: str) -> Tuple[Dict[str, Any], int, int]:
+    """Extract text from one file in a worker process, with the statistics it added"""
+    processed, errors = _worker_extractor.files_processed, _worker_extractor.extraction_errors
+    result = _worker_extractor.extract_text(file_path, file_extension)
+    return (result,
+            _worker_extractor.files_processed - processed,
+            _worker_extractor.extraction_errors - errors)
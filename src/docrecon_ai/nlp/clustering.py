@@ -5,7 +5,11 @@ Clusters documents based on their semantic embeddings to identify
 related content and organize documents by topic/theme.
 """
 
+import hashlib
+import os
+import pickle
 import numpy as np
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 
@@ -13,16 +17,35 @@ logger = logging.getLogger(__name__)
 
 # Optional clustering dependencies
 try:
-    from sklearn.cluster import KMeans, DBSCAN, AgglomerativeClustering
+    from sklearn.cluster import KMeans, MiniBatchKMeans, DBSCAN, AgglomerativeClustering
     from sklearn.metrics import silhouette_score
-    from sklearn.decomposition import PCA
+    from joblib import Parallel, delayed
+    from threadpoolctl import threadpool_limits
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.neighbors import kneighbors_graph
+    from scipy.spatial.distance import pdist
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
     logger.warning("scikit-learn not available. Install: pip install scikit-learn")
 
+# Optional JIT acceleration for similar-cluster search over many clusters
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
 try:
     import matplotlib.pyplot as plt
+    from matplotlib.patches import Patch
     import seaborn as sns
     PLOTTING_AVAILABLE = True
 except ImportError:
@@ -36,6 +59,7 @@ class DocumentClusterer:
     
     Supports multiple clustering algorithms:
     - K-Means clustering
+    - K-Means on faiss (large corpora)
     - DBSCAN (density-based)
     - Agglomerative clustering
     """
@@ -56,12 +80,32 @@ class DocumentClusterer:
         # Clustering settings
         self.similarity_threshold = getattr(config.nlp, 'similarity_threshold', 0.85) if config else 0.85
         self.enable_clustering = getattr(config.nlp, 'enable_clustering', True) if config else True
+        self.minibatch_threshold = 10_000  # Above this many documents K-Means runs on mini-batches
+        self.sweep_workers = -1  # Processes scoring cluster counts in parallel (-1: all cores)
+        self.parallel_sweep_threshold = 1000  # Fewer documents are scored in-process
+        self.silhouette_sample_size = 2000  # Documents sampled for silhouette scores (O(n^2))
+        self.jit_pair_threshold = 200  # Above this many clusters, similar pairs are found without a k x k matrix
+        self.connectivity_threshold = 5000  # Above this many documents agglomerative clustering merges only neighbours
+        self.connectivity_neighbors = 30  # Neighbours per document in the agglomerative connectivity graph
         
         # Clustering results
         self.clusters = {}
         self.cluster_labels = {}
         self.cluster_centers = {}
         self.silhouette_scores = {}
+        self._cluster_fingerprints = {}  # method -> fingerprint of the input of clusters[method]
+        
+        # Results are also kept on disk by input fingerprint, so an unchanged
+        # corpus is not reclustered by the next run
+        cache_dir = getattr(config, 'cache_dir', '~/.docrecon_cache') if config else '~/.docrecon_cache'
+        self.cache_dir = Path(cache_dir).expanduser() / "clusters"
+        self.max_cached_results = 8  # Newest result files kept in cache_dir
+        
+        # Last prepared embedding matrix and its L2-normalised rows (computed
+        # on first use), see _prepare_embeddings
+        self._X = None
+        self._X_digest = None
+        self._Xn = None
         
         # Statistics
         self.documents_clustered = 0
@@ -74,7 +118,7 @@ class DocumentClusterer:
         
         Args:
             embeddings: Dictionary mapping document IDs to embedding vectors
-            method: Clustering method ("kmeans", "dbscan", "agglomerative")
+            method: Clustering method ("kmeans", "faiss", "dbscan", "agglomerative")
             **kwargs: Additional clustering parameters
             
         Returns:
@@ -83,14 +127,72 @@ class DocumentClusterer:
         if not embeddings:
             return {}
         
+        document_ids, embedding_matrix = self._as_matrix(embeddings)
+        
+        return self.cluster_embedding_matrix(document_ids, embedding_matrix, method, **kwargs)
+    
+    def _as_matrix(self, embeddings: Dict[str, np.ndarray]) -> Tuple[List[str], np.ndarray]:
+        """
+        Document IDs and contiguous float32 matrix (one row per ID) of embeddings.
+        
+        The matrix is stacked on every call, so vectors changed in place are
+        picked up; whether a stacked matrix has the same contents as one
+        clustered before is decided by _prepare_embeddings' content digest.
+        """
         document_ids = list(embeddings.keys())
-        embedding_matrix = np.array(list(embeddings.values()))
+        vectors = list(embeddings.values())
+        
+        first = np.asarray(vectors[0]).ravel()
+        matrix = np.empty((len(vectors), first.shape[0]), dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            matrix[i] = np.asarray(vector).ravel()
+        
+        return document_ids, matrix
+    
+    def cluster_embedding_matrix(self, document_ids: List[str], embedding_matrix: np.ndarray,
+                                 method: str = "kmeans", **kwargs) -> Dict[str, Any]:
+        """
+        Cluster documents from an already stacked embedding matrix.
+        
+        Args:
+            document_ids: Document ID of each matrix row
+            embedding_matrix: Embedding vectors, one row per document
+            method: Clustering method ("kmeans", "faiss", "dbscan", "agglomerative")
+            **kwargs: Additional clustering parameters
+            
+        Returns:
+            dict: Clustering results with cluster assignments and metadata
+        """
+        if not document_ids:
+            return {}
+        
+        embedding_matrix, matrix_digest = self._prepare_embeddings(embedding_matrix)
+        
+        # Clustering is deterministic, so identical input (same documents,
+        # embeddings and parameters) reuses the previous result, from this
+        # run or an earlier one
+        fingerprint = self._get_input_fingerprint(document_ids, matrix_digest, method, kwargs)
+        if fingerprint is not None:
+            if self._cluster_fingerprints.get(method) == fingerprint and method in self.clusters:
+                self.logger.info(f"Embeddings unchanged, reusing {method} clustering of {len(document_ids)} documents")
+                return self.clusters[method]
+            
+            results = self._load_cached_result(fingerprint)
+            if results is not None:
+                self.logger.info(f"Embeddings unchanged, reusing cached {method} clustering of {len(document_ids)} documents")
+                self.clusters[method] = results
+                self._cluster_fingerprints[method] = fingerprint
+                self.documents_clustered = len(document_ids)
+                self.clusters_created = len(results['groups'])
+                return results
         
         self.logger.info(f"Clustering {len(document_ids)} documents using {method}")
         
         # Perform clustering
         if method.lower() == "kmeans":
             results = self._cluster_kmeans(document_ids, embedding_matrix, **kwargs)
+        elif method.lower() == "faiss":
+            results = self._cluster_faiss(document_ids, embedding_matrix, **kwargs)
         elif method.lower() == "dbscan":
             results = self._cluster_dbscan(document_ids, embedding_matrix, **kwargs)
         elif method.lower() == "agglomerative":
@@ -98,34 +200,142 @@ class DocumentClusterer:
         else:
             raise ValueError(f"Unsupported clustering method: {method}")
         
+        # Labels as int32 and document IDs grouped per cluster, so summaries
+        # don't regroup the assignments dict
+        results['labels'] = np.asarray(results['labels'], dtype=np.int32)
+        results['groups'] = _group_by_label(results['labels'], document_ids)
+        
         # Store results
         self.clusters[method] = results
+        self._cluster_fingerprints[method] = fingerprint
         self.documents_clustered = len(document_ids)
-        self.clusters_created = len(set(results['labels']))
+        self.clusters_created = len(results['groups'])
+        if fingerprint is not None:
+            self._save_cached_result(fingerprint, results)
         
         return results
     
+    def _prepare_embeddings(self, embedding_matrix: np.ndarray) -> Tuple[np.ndarray, str]:
+        """
+        Embedding matrix as contiguous float32 (without copying if it already
+        is) and a digest of its contents.
+        
+        The matrix is remembered, so its normalised rows are computed at most
+        once while its contents stay the same (even across restacked copies).
+        """
+        matrix = np.ascontiguousarray(embedding_matrix, dtype=np.float32)
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr(matrix.shape).encode())
+        hasher.update(memoryview(matrix).cast('B'))
+        digest = hasher.hexdigest()
+        
+        if digest != self._X_digest:
+            self._Xn = None
+        self._X = matrix
+        self._X_digest = digest
+        return matrix, digest
+    
+    def _get_normalized_embeddings(self, embeddings: np.ndarray) -> np.ndarray:
+        """L2-normalised rows of embeddings (all-zero rows stay zero), cached for the prepared matrix"""
+        if embeddings is self._X and self._Xn is not None:
+            return self._Xn
+        
+        normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True).clip(min=1e-12)
+        if embeddings is self._X:
+            self._Xn = normalized
+        return normalized
+    
+    def _get_input_fingerprint(self, document_ids: List[str], matrix_digest: str,
+                               method: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Hash of everything a clustering result depends on.
+        
+        Array and sparse matrix parameters are hashed by their contents, as
+        their repr is abbreviated. Returns None if a parameter cannot be
+        hashed reliably (e.g. an estimator object), so the result is not reused.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr((method.lower(), matrix_digest)).encode())
+        for key, value in sorted(kwargs.items()):
+            hasher.update(repr(key).encode())
+            if not _hash_parameter(hasher, value):
+                return None
+        hasher.update('\0'.join(document_ids).encode('utf-8', errors='surrogatepass'))
+        return hasher.hexdigest()
+    
+    def _load_cached_result(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Clustering result stored for fingerprint by an earlier run, if any"""
+        cache_file = self.cache_dir / f"{fingerprint}.pkl"
+        if not cache_file.exists():
+            return None
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                results = pickle.load(f)
+            os.utime(cache_file)  # Recently used results are pruned last
+            return results
+        except Exception as e:
+            self.logger.warning(f"Failed to load cached clustering {cache_file}: {e}")
+            return None
+    
+    def _save_cached_result(self, fingerprint: str, results: Dict[str, Any]):
+        """Store a clustering result for later runs, keeping the newest max_cached_results"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Written under a temporary name and renamed, so readers never
+            # see a partial file
+            cache_file = self.cache_dir / f"{fingerprint}.pkl"
+            tmp_file = self.cache_dir / f"{fingerprint}.{os.getpid()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+            
+            cached = sorted(self.cache_dir.glob("*.pkl"), key=lambda path: path.stat().st_mtime, reverse=True)
+            for old_file in cached[self.max_cached_results:]:
+                old_file.unlink(missing_ok=True)
+        except Exception as e:
+            self.logger.warning(f"Failed to cache clustering result: {e}")
+    
     def _cluster_kmeans(self, document_ids: List[str], embeddings: np.ndarray, 
                        n_clusters: int = None, **kwargs) -> Dict[str, Any]:
         """Perform K-Means clustering"""
-        # Determine optimal number of clusters if not specified
+        # Determine optimal number of clusters if not specified; the sweep's
+        # fit for that number is reused unless extra K-Means options are given
+        kmeans = None
         if n_clusters is None:
-            n_clusters = self._estimate_optimal_clusters(embeddings, method="kmeans")
+            n_clusters, kmeans = self._estimate_optimal_clusters(embeddings, method="kmeans")
+            if kwargs:
+                kmeans = None
         
-        # Perform clustering
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, **kwargs)
-        labels = kmeans.fit_predict(embeddings)
+        if kmeans is not None:
+            labels = kmeans.labels_
+        else:
+            # Perform clustering; large corpora use mini-batches, which converge
+            # in far fewer passes over the data to approximately the same centers
+            # Defaults only fill in options the caller did not pass
+            params = dict(kwargs)
+            params.setdefault('random_state', 42)
+            if len(embeddings) > self.minibatch_threshold:
+                params.setdefault('batch_size', 1024)
+                params.setdefault('n_init', 3)
+                kmeans = MiniBatchKMeans(n_clusters=n_clusters, **params)
+            else:
+                # One run from a subsampled k-means++ seeding, unless the
+                # caller chose the initialisation or the number of runs
+                if 'init' not in params and 'n_init' not in params:
+                    params.update(init=self._kpp_init(embeddings, n_clusters), n_init=1)
+                kmeans = KMeans(n_clusters=n_clusters, **params)
+            labels = kmeans.fit_predict(embeddings)
         
         # Calculate silhouette score
-        if len(set(labels)) > 1:
-            silhouette = silhouette_score(embeddings, labels)
+        if len(np.unique(labels)) > 1:
+            silhouette = _sampled_silhouette_score(embeddings, labels, self.silhouette_sample_size)
         else:
             silhouette = 0.0
         
-        # Create cluster assignments
-        cluster_assignments = {}
-        for doc_id, label in zip(document_ids, labels):
-            cluster_assignments[doc_id] = int(label)
+        # Create cluster assignments (tolist() converts to Python ints in C)
+        cluster_assignments = dict(zip(document_ids, labels.tolist()))
         
         # Get cluster centers
         cluster_centers = {}
@@ -142,6 +352,95 @@ class DocumentClusterer:
             'inertia': kmeans.inertia_,
         }
     
+    def _kpp_init(self, embeddings: np.ndarray, n_clusters: int, subsample: int = 10_000) -> np.ndarray:
+        """
+        k-means++ seeding on a random subsample, as initial centers for KMeans.
+        
+        Squared distances to each new center come from the row norms,
+        computed once, and one matrix-vector product, so seeding costs
+        O(subsample * n_clusters * dim) instead of sklearn's repeated
+        candidate trials over all documents.
+        """
+        rng = np.random.RandomState(42)
+        if len(embeddings) > subsample:
+            sample = embeddings[rng.choice(len(embeddings), subsample, replace=False)]
+        else:
+            sample = embeddings
+        
+        squared_norms = np.einsum('ij,ij->i', sample, sample)
+        centers = np.empty((n_clusters, sample.shape[1]), dtype=sample.dtype)
+        
+        first = rng.randint(len(sample))
+        centers[0] = sample[first]
+        closest = np.maximum(squared_norms + squared_norms[first] - 2.0 * (sample @ sample[first]), 0.0)
+        
+        # Greedy k-means++: draw a few candidates with probability proportional
+        # to their squared distance from the nearest chosen center and keep
+        # the one that lowers the total distance most
+        n_trials = 2 + int(np.log(n_clusters))
+        for c in range(1, n_clusters):
+            total = closest.sum()
+            if total > 0:
+                candidates = rng.choice(len(sample), n_trials, p=closest / total)
+            else:
+                candidates = rng.randint(len(sample), size=n_trials)
+            
+            distances = np.maximum(
+                squared_norms[candidates, None] + squared_norms[None, :] - 2.0 * (sample[candidates] @ sample.T), 0.0
+            )
+            np.minimum(distances, closest, out=distances)
+            best = np.argmin(distances.sum(axis=1))
+            
+            centers[c] = sample[candidates[best]]
+            closest = distances[best]
+        
+        return centers
+    
+    def _cluster_faiss(self, document_ids: List[str], embeddings: np.ndarray,
+                       n_clusters: int = None, niter: int = 20, spherical: bool = False,
+                       use_gpu: bool = False, **kwargs) -> Dict[str, Any]:
+        """Perform K-Means clustering with faiss (SIMD/GPU distance computations)"""
+        if not FAISS_AVAILABLE:
+            self.logger.warning("faiss not available, falling back to scikit-learn K-Means. Install: pip install faiss-cpu")
+            return self._cluster_kmeans(document_ids, embeddings, n_clusters=n_clusters)
+        
+        # Determine optimal number of clusters if not specified
+        if n_clusters is None:
+            n_clusters, _ = self._estimate_optimal_clusters(embeddings, method="kmeans")
+        
+        # Perform clustering; spherical K-Means keeps unit-length centers,
+        # i.e. clusters by cosine similarity
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        kmeans = faiss.Kmeans(matrix.shape[1], n_clusters, niter=niter, seed=42,
+                              spherical=spherical, gpu=use_gpu, **kwargs)
+        kmeans.train(matrix)
+        _, assigned = kmeans.index.search(matrix, 1)
+        labels = assigned.ravel().astype(np.int64)
+        
+        # Calculate silhouette score
+        if len(np.unique(labels)) > 1:
+            silhouette = _sampled_silhouette_score(embeddings, labels, self.silhouette_sample_size)
+        else:
+            silhouette = 0.0
+        
+        # Create cluster assignments (tolist() converts to Python ints in C)
+        cluster_assignments = dict(zip(document_ids, labels.tolist()))
+        
+        # Get cluster centers
+        cluster_centers = {}
+        for i, center in enumerate(kmeans.centroids):
+            cluster_centers[i] = center
+        
+        return {
+            'method': 'faiss',
+            'assignments': cluster_assignments,
+            'labels': labels,
+            'cluster_centers': cluster_centers,
+            'n_clusters': n_clusters,
+            'silhouette_score': silhouette,
+            'inertia': float(kmeans.obj[-1]) if len(kmeans.obj) else 0.0,
+        }
+    
     def _cluster_dbscan(self, document_ids: List[str], embeddings: np.ndarray,
                        eps: float = None, min_samples: int = None, **kwargs) -> Dict[str, Any]:
         """Perform DBSCAN clustering"""
@@ -151,24 +450,33 @@ class DocumentClusterer:
         if min_samples is None:
             min_samples = max(2, len(document_ids) // 50)  # Adaptive min_samples
         
+        # Cosine distance on unit vectors is half the squared euclidean
+        # distance, so cluster the normalised vectors with the equivalent
+        # euclidean eps; sklearn can then use BLAS or a tree index for the
+        # neighbourhood queries instead of its scalar cosine path
+        normalized = self._get_normalized_embeddings(embeddings)
+        kwargs.setdefault('n_jobs', -1)
+        
         # Perform clustering
-        dbscan = DBSCAN(eps=eps, min_samples=min_samples, metric='cosine', **kwargs)
-        labels = dbscan.fit_predict(embeddings)
+        dbscan = DBSCAN(eps=np.sqrt(2.0 * eps), min_samples=min_samples, metric='euclidean', **kwargs)
+        labels = dbscan.fit_predict(normalized)
+        
+        # Cluster IDs and sizes in one pass; -1 (noise) sorts first
+        unique_labels, label_counts = np.unique(labels, return_counts=True)
+        has_noise = len(unique_labels) > 0 and unique_labels[0] == -1
         
         # Calculate silhouette score (excluding noise points)
-        if len(set(labels)) > 1 and -1 not in labels:
-            silhouette = silhouette_score(embeddings, labels)
+        if len(unique_labels) > 1 and not has_noise:
+            silhouette = _sampled_silhouette_score(embeddings, labels, self.silhouette_sample_size)
         else:
             silhouette = 0.0
         
-        # Create cluster assignments
-        cluster_assignments = {}
-        for doc_id, label in zip(document_ids, labels):
-            cluster_assignments[doc_id] = int(label)
+        # Create cluster assignments (tolist() converts to Python ints in C)
+        cluster_assignments = dict(zip(document_ids, labels.tolist()))
         
         # Count clusters (excluding noise cluster -1)
-        n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
-        n_noise = list(labels).count(-1)
+        n_clusters = len(unique_labels) - int(has_noise)
+        n_noise = int(label_counts[0]) if has_noise else 0
         
         return {
             'method': 'dbscan',
@@ -184,24 +492,30 @@ class DocumentClusterer:
     def _cluster_agglomerative(self, document_ids: List[str], embeddings: np.ndarray,
                               n_clusters: int = None, linkage: str = 'ward', **kwargs) -> Dict[str, Any]:
         """Perform Agglomerative clustering"""
+        # Without a connectivity graph every pair of documents is a merge
+        # candidate (O(n^2) memory); restrict merges to nearest neighbours
+        if 'connectivity' not in kwargs:
+            connectivity = self._build_connectivity(embeddings)
+            if connectivity is not None:
+                kwargs['connectivity'] = connectivity
+        
         # Determine optimal number of clusters if not specified
         if n_clusters is None:
-            n_clusters = self._estimate_optimal_clusters(embeddings, method="agglomerative")
+            n_clusters, _ = self._estimate_optimal_clusters(embeddings, method="agglomerative",
+                                                            connectivity=kwargs.get('connectivity'))
         
         # Perform clustering
         agg = AgglomerativeClustering(n_clusters=n_clusters, linkage=linkage, **kwargs)
         labels = agg.fit_predict(embeddings)
         
         # Calculate silhouette score
-        if len(set(labels)) > 1:
-            silhouette = silhouette_score(embeddings, labels)
+        if len(np.unique(labels)) > 1:
+            silhouette = _sampled_silhouette_score(embeddings, labels, self.silhouette_sample_size)
         else:
             silhouette = 0.0
         
-        # Create cluster assignments
-        cluster_assignments = {}
-        for doc_id, label in zip(document_ids, labels):
-            cluster_assignments[doc_id] = int(label)
+        # Create cluster assignments (tolist() converts to Python ints in C)
+        cluster_assignments = dict(zip(document_ids, labels.tolist()))
         
         return {
             'method': 'agglomerative',
@@ -212,8 +526,38 @@ class DocumentClusterer:
             'linkage': linkage,
         }
     
-    def _estimate_optimal_clusters(self, embeddings: np.ndarray, method: str = "kmeans") -> int:
-        """Estimate optimal number of clusters using elbow method or silhouette analysis"""
+    def _build_connectivity(self, embeddings: np.ndarray):
+        """
+        Sparse k-nearest-neighbour graph for agglomerative clustering.
+        
+        Returns:
+            Connectivity matrix, or None if there are too few documents to need one
+        """
+        n_samples = len(embeddings)
+        if n_samples <= self.connectivity_threshold:
+            return None
+        
+        n_neighbors = min(self.connectivity_neighbors, n_samples - 1)
+        self.logger.info(f"Restricting agglomerative merges to {n_neighbors} nearest neighbours "
+                         f"of each of {n_samples} documents")
+        return kneighbors_graph(embeddings, n_neighbors, mode='connectivity',
+                                include_self=False, n_jobs=-1)
+    
+    def _estimate_optimal_clusters(self, embeddings: np.ndarray,
+                                   method: str = "kmeans",
+                                   connectivity=None) -> Tuple[int, Optional[Any]]:
+        """
+        Estimate optimal number of clusters using silhouette analysis.
+        
+        Args:
+            embeddings: Embedding matrix
+            method: Clustering method the estimate is for
+            connectivity: Connectivity graph for agglomerative fits (optional)
+        
+        Returns:
+            tuple: Best number of clusters and the sweep's fitted K-Means
+                estimator for it (None for other methods)
+        """
         n_samples = len(embeddings)
         
         # Reasonable range for number of clusters
@@ -221,56 +565,118 @@ class DocumentClusterer:
         max_clusters = min(10, n_samples // 3)
         
         if max_clusters <= min_clusters:
-            return min_clusters
+            return min_clusters, None
         
         best_score = -1
         best_k = min_clusters
+        cluster_counts = range(min_clusters, max_clusters + 1)
+        estimators = {}
         
-        for k in range(min_clusters, max_clusters + 1):
-            try:
-                if method == "kmeans":
-                    kmeans = KMeans(n_clusters=k, random_state=42)
+        if method == "kmeans":
+            # The K-Means sweep is warm-started: run k+1 starts from the centers
+            # of run k plus the sample farthest from its center, so Elkan's
+            # triangle-inequality bounds skip most distance computations.
+            # The fits therefore run in order; only the scoring is parallel
+            candidates = []
+            tasks = []
+            next_init = self._kpp_init(embeddings, min_clusters)
+            for k in cluster_counts:
+                try:
+                    kmeans = KMeans(n_clusters=k, init=next_init, n_init=1,
+                                    algorithm='elkan', random_state=42)
                     labels = kmeans.fit_predict(embeddings)
-                elif method == "agglomerative":
-                    agg = AgglomerativeClustering(n_clusters=k)
-                    labels = agg.fit_predict(embeddings)
-                else:
+                    
+                    centers = kmeans.cluster_centers_
+                    residuals = embeddings - centers[labels]
+                    farthest = np.argmax(np.einsum('ij,ij->i', residuals, residuals))
+                    next_init = np.vstack([centers, embeddings[farthest]])
+                except Exception as e:
+                    self.logger.warning(f"Error evaluating {k} clusters: {e}")
                     continue
                 
-                # Calculate silhouette score
-                if len(set(labels)) > 1:
-                    score = silhouette_score(embeddings, labels)
-                    if score > best_score:
-                        best_score = score
-                        best_k = k
-                        
-            except Exception as e:
-                self.logger.warning(f"Error evaluating {k} clusters: {e}")
-                continue
+                candidates.append(k)
+                estimators[k] = kmeans
+                tasks.append(delayed(_score_clustering)(embeddings, labels, self.silhouette_sample_size))
+        elif method == "agglomerative":
+            # Independent fits, so each k is fitted and scored in a worker
+            candidates = list(cluster_counts)
+            tasks = [
+                delayed(_fit_and_score_agglomerative)(embeddings, k, self.silhouette_sample_size,
+                                                      connectivity)
+                for k in candidates
+            ]
+        else:
+            candidates = []
+            tasks = []
+        
+        # Silhouette scores are independent per k; score them in worker
+        # processes (one BLAS thread each) unless the input is small
+        n_jobs = self.sweep_workers if n_samples >= self.parallel_sweep_threshold else 1
+        scores = Parallel(n_jobs=n_jobs, prefer='processes')(tasks) if tasks else []
+        
+        for k, (score, error) in zip(candidates, scores):
+            if error:
+                self.logger.warning(f"Error evaluating {k} clusters: {error}")
+            elif score is not None and score > best_score:
+                best_score = score
+                best_k = k
         
         self.logger.info(f"Estimated optimal clusters: {best_k} (silhouette score: {best_score:.3f})")
-        return best_k
+        return best_k, estimators.get(best_k)
+    
+    def build_document_info_soa(self, document_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Columnar (structure-of-arrays) form of document metadata for cluster summaries.
+        
+        Args:
+            document_info: Document metadata per document ID
+            
+        Returns:
+            dict: 'ids', 'index' (ID -> row), 'sizes' array, 'ext_codes' array
+                and 'ext_vocab' (extension of each code)
+        """
+        ids = list(document_info.keys())
+        ext_codes_by_ext = {}
+        ext_codes = np.fromiter(
+            (ext_codes_by_ext.setdefault(document_info[doc_id].get('file_extension', '').lower(), len(ext_codes_by_ext))
+             for doc_id in ids),
+            dtype=np.intp, count=len(ids)
+        )
+        
+        return {
+            'ids': ids,
+            'index': {doc_id: i for i, doc_id in enumerate(ids)},
+            'sizes': np.asarray([document_info[doc_id].get('size', 0) for doc_id in ids]),
+            'ext_codes': ext_codes,
+            'ext_vocab': list(ext_codes_by_ext.keys()),
+        }
     
     def get_cluster_summary(self, cluster_results: Dict[str, Any], 
-                           document_info: Dict[str, Any] = None) -> Dict[int, Dict[str, Any]]:
+                           document_info: Dict[str, Any] = None,
+                           document_info_soa: Dict[str, Any] = None) -> Dict[int, Dict[str, Any]]:
         """
         Get summary information for each cluster.
         
         Args:
             cluster_results: Results from clustering
             document_info: Optional document metadata
+            document_info_soa: build_document_info_soa(document_info), if
+                already built (built here otherwise)
             
         Returns:
             dict: Summary for each cluster
         """
-        assignments = cluster_results['assignments']
+        # Documents grouped by cluster (grouped here for results without 'groups')
+        clusters = cluster_results.get('groups')
+        if clusters is None:
+            assignments = cluster_results['assignments']
+            labels = np.fromiter(assignments.values(), dtype=np.int32, count=len(assignments))
+            clusters = _group_by_label(labels, list(assignments.keys()))
         
-        # Group documents by cluster
-        clusters = {}
-        for doc_id, cluster_id in assignments.items():
-            if cluster_id not in clusters:
-                clusters[cluster_id] = []
-            clusters[cluster_id].append(doc_id)
+        # Sizes and extensions as arrays, so per-cluster totals are numpy
+        # reductions instead of Python loops over metadata dicts
+        if document_info and document_info_soa is None:
+            document_info_soa = self.build_document_info_soa(document_info)
         
         # Create summary for each cluster
         cluster_summary = {}
@@ -284,26 +690,29 @@ class DocumentClusterer:
             
             # Add document metadata if available
             if document_info:
+                index = document_info_soa['index']
+                rows = np.fromiter((index[doc_id] for doc_id in doc_ids if doc_id in index), dtype=np.intp)
+                
                 summary['documents'] = []
-                total_size = 0
-                file_types = {}
+                for row in rows.tolist():
+                    doc = document_info[document_info_soa['ids'][row]]
+                    summary['documents'].append({
+                        'id': document_info_soa['ids'][row],
+                        'filename': doc.get('filename', ''),
+                        'path': doc.get('path', ''),
+                        'size': doc.get('size', 0),
+                        'modified_date': doc.get('modified_date', ''),
+                    })
+                
+                total_size = document_info_soa['sizes'][rows].sum().item() if len(rows) else 0
                 
-                for doc_id in doc_ids:
-                    if doc_id in document_info:
-                        doc = document_info[doc_id]
-                        summary['documents'].append({
-                            'id': doc_id,
-                            'filename': doc.get('filename', ''),
-                            'path': doc.get('path', ''),
-                            'size': doc.get('size', 0),
-                            'modified_date': doc.get('modified_date', ''),
-                        })
-                        
-                        total_size += doc.get('size', 0)
-                        
-                        # Count file types
-                        ext = doc.get('file_extension', '').lower()
-                        file_types[ext] = file_types.get(ext, 0) + 1
+                # Count file types
+                ext_counts = np.bincount(document_info_soa['ext_codes'][rows],
+                                         minlength=len(document_info_soa['ext_vocab']))
+                file_types = {
+                    document_info_soa['ext_vocab'][code]: int(ext_counts[code])
+                    for code in np.flatnonzero(ext_counts).tolist()
+                }
                 
                 summary['total_size'] = total_size
                 summary['file_types'] = file_types
@@ -332,25 +741,37 @@ class DocumentClusterer:
         if not cluster_centers:
             return []
         
-        similar_pairs = []
         cluster_ids = list(cluster_centers.keys())
+        centers = np.stack([np.asarray(cluster_centers[cluster_id]).ravel() for cluster_id in cluster_ids])
         
-        for i, cluster1_id in enumerate(cluster_ids):
-            for cluster2_id in cluster_ids[i+1:]:
-                center1 = cluster_centers[cluster1_id]
-                center2 = cluster_centers[cluster2_id]
-                
-                # Calculate cosine similarity
-                from sklearn.metrics.pairwise import cosine_similarity
-                similarity = cosine_similarity([center1], [center2])[0, 0]
-                
-                if similarity >= similarity_threshold:
-                    similar_pairs.append((cluster1_id, cluster2_id, float(similarity)))
+        if NUMBA_AVAILABLE and len(cluster_ids) > self.jit_pair_threshold:
+            # Many clusters: stream over the pairs in compiled code and keep
+            # only those above the threshold, instead of a k x k matrix
+            centers = centers.astype(np.float32)
+            centers /= np.linalg.norm(centers, axis=1, keepdims=True).clip(min=1e-12)
+            counts = _count_pairs_above(centers, np.float32(similarity_threshold))
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            rows, cols, pair_similarities = _collect_pairs_above(
+                centers, np.float32(similarity_threshold), offsets, int(counts.sum())
+            )
+        else:
+            # Similarities of each unordered pair once, in condensed
+            # (upper-triangle) order, without a k x k matrix; pairs with an
+            # all-zero center get similarity 0
+            similarities = 1.0 - pdist(centers, metric='cosine')
+            np.nan_to_num(similarities, copy=False, nan=0.0)
+            
+            pair_index = np.flatnonzero(similarities >= similarity_threshold)
+            rows, cols = _condensed_to_pairs(pair_index, len(cluster_ids))
+            pair_similarities = similarities[pair_index]
         
         # Sort by similarity (descending)
-        similar_pairs.sort(key=lambda x: x[2], reverse=True)
+        order = np.argsort(-pair_similarities, kind='stable')
         
-        return similar_pairs
+        return [
+            (cluster_ids[rows[i]], cluster_ids[cols[i]], float(pair_similarities[i]))
+            for i in order
+        ]
     
     def visualize_clusters(self, embeddings: Dict[str, np.ndarray], 
                           cluster_results: Dict[str, Any], 
@@ -372,43 +793,53 @@ class DocumentClusterer:
         
         try:
             # Prepare data
-            document_ids = list(embeddings.keys())
-            embedding_matrix = np.array(list(embeddings.values()))
-            labels = [cluster_results['assignments'].get(doc_id, -1) for doc_id in document_ids]
+            document_ids, embedding_matrix = self._as_matrix(embeddings)
+            assignments = cluster_results['assignments']
+            labels = np.fromiter((assignments.get(doc_id, -1) for doc_id in document_ids),
+                                 dtype=np.int64, count=len(document_ids))
             
-            # Reduce dimensionality to 2D using PCA
-            pca = PCA(n_components=2, random_state=42)
-            embeddings_2d = pca.fit_transform(embedding_matrix)
+            # Reduce dimensionality to 2D: PCA computed as a randomized
+            # truncated SVD of the centered float32 matrix (only 2 components
+            # are needed, so no full SVD)
+            embedding_matrix = np.asarray(embedding_matrix, dtype=np.float32)
+            mean = embedding_matrix.mean(axis=0)
+            pca = TruncatedSVD(n_components=2, algorithm='randomized', n_iter=2, random_state=42)
+            embeddings_2d = pca.fit_transform(embedding_matrix - mean)
             
             # Create plot
             plt.figure(figsize=(12, 8))
             
-            # Plot points colored by cluster
-            unique_labels = set(labels)
-            colors = plt.cm.Set3(np.linspace(0, 1, len(unique_labels)))
+            # Plot all clustered points in one call, colored per cluster, and
+            # the noise points (for DBSCAN) in another
+            noise = labels == -1
+            unique_labels, codes = np.unique(labels[~noise], return_inverse=True)
+            colors = plt.cm.Set3(np.linspace(0, 1, len(unique_labels) + int(noise.any())))
+            
+            plt.scatter(embeddings_2d[~noise, 0], embeddings_2d[~noise, 1],
+                        c=colors[codes], s=50, alpha=0.7)
+            legend_handles = [
+                Patch(color=colors[i], alpha=0.7, label=f'Cluster {label}')
+                for i, label in enumerate(unique_labels.tolist())
+            ]
             
-            for label, color in zip(unique_labels, colors):
-                if label == -1:
-                    # Noise points (for DBSCAN)
-                    mask = np.array(labels) == label
-                    plt.scatter(embeddings_2d[mask, 0], embeddings_2d[mask, 1], 
-                              c='black', marker='x', s=50, alpha=0.6, label='Noise')
-                else:
-                    mask = np.array(labels) == label
-                    plt.scatter(embeddings_2d[mask, 0], embeddings_2d[mask, 1], 
-                              c=[color], s=50, alpha=0.7, label=f'Cluster {label}')
+            if noise.any():
+                legend_handles.append(plt.scatter(embeddings_2d[noise, 0], embeddings_2d[noise, 1],
+                                                  c='black', marker='x', s=50, alpha=0.6, label='Noise'))
             
             # Plot cluster centers if available
-            if 'cluster_centers' in cluster_results:
-                centers_2d = pca.transform(list(cluster_results['cluster_centers'].values()))
-                plt.scatter(centers_2d[:, 0], centers_2d[:, 1], 
-                          c='red', marker='*', s=200, alpha=0.8, 
-                          edgecolors='black', linewidth=1, label='Centers')
+            if cluster_results.get('cluster_centers'):
+                # Projected with the components fitted on the documents alone
+                centers = np.stack([np.asarray(center, dtype=np.float32).ravel()
+                                    for center in cluster_results['cluster_centers'].values()])
+                centers_2d = (centers - mean) @ pca.components_.T
+                legend_handles.append(plt.scatter(centers_2d[:, 0], centers_2d[:, 1],
+                                                  c='red', marker='*', s=200, alpha=0.8,
+                                                  edgecolors='black', linewidth=1, label='Centers'))
             
             plt.title(f"Document Clusters ({cluster_results['method'].upper()})")
             plt.xlabel(f"PC1 ({pca.explained_variance_ratio_[0]:.1%} variance)")
             plt.ylabel(f"PC2 ({pca.explained_variance_ratio_[1]:.1%} variance)")
-            plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+            plt.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc='upper left')
             plt.grid(True, alpha=0.3)
             plt.tight_layout()
             
@@ -446,4 +877,162 @@ class DocumentClusterer:
         self.cluster_labels = {}
         self.cluster_centers = {}
         self.silhouette_scores = {}
+        self._cluster_fingerprints = {}
+        self._X = None
+        self._X_digest = None
+        self._Xn = None
+
+
+def _hash_parameter(hasher, value) -> bool:
+    """
+    Feed a clustering parameter into hasher by value.
+    
+    Returns False for values that cannot be hashed reliably.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        hasher.update(repr(value).encode())
+        return True
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return False
+        array = np.ascontiguousarray(value)
+        hasher.update(repr(('ndarray', array.dtype.str, array.shape)).encode())
+        hasher.update(memoryview(array).cast('B'))
+        return True
+    if hasattr(value, 'tocsr') and hasattr(value, 'shape'):
+        # scipy sparse matrix or array
+        matrix = value.tocsr()
+        matrix.sum_duplicates()
+        hasher.update(repr(('sparse', matrix.dtype.str, matrix.shape)).encode())
+        for part in (matrix.data, matrix.indices, matrix.indptr):
+            hasher.update(memoryview(np.ascontiguousarray(part)).cast('B'))
+        return True
+    if isinstance(value, (list, tuple)):
+        hasher.update(repr((type(value).__name__, len(value))).encode())
+        return all(_hash_parameter(hasher, item) for item in value)
+    if isinstance(value, dict):
+        hasher.update(repr(('dict', len(value))).encode())
+        for key in sorted(value, key=repr):
+            hasher.update(repr(key).encode())
+            if not _hash_parameter(hasher, value[key]):
+                return False
+        return True
+    return False
+
+
+def _condensed_to_pairs(index: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row and column (row < column) of entries of a condensed n x n distance matrix (pdist order)"""
+    rows = (n - 2 - np.floor(np.sqrt(-8.0 * index + 4.0 * n * (n - 1) - 7) / 2.0 - 0.5)).astype(np.intp)
+    cols = index + rows + 1 - n * (n - 1) // 2 + (n - rows) * (n - rows - 1) // 2
+    return rows, cols
+
 
+def _count_pairs_above(centers: np.ndarray, threshold: float) -> np.ndarray:
+    """Per row i, the number of rows j > i whose dot product with row i is at least threshold"""
+    n_centers, dim = centers.shape
+    counts = np.zeros(n_centers, dtype=np.int64)
+    
+    for i in prange(n_centers):
+        count = 0
+        for j in range(i + 1, n_centers):
+            similarity = np.float32(0.0)
+            for d in range(dim):
+                similarity += centers[i, d] * centers[j, d]
+            if similarity >= threshold:
+                count += 1
+        counts[i] = count
+    
+    return counts
+
+
+def _collect_pairs_above(centers: np.ndarray, threshold: float, offsets: np.ndarray,
+                         n_pairs: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rows, columns and dot products of the pairs counted by _count_pairs_above, in (i, j) order"""
+    n_centers, dim = centers.shape
+    rows = np.empty(n_pairs, dtype=np.int64)
+    cols = np.empty(n_pairs, dtype=np.int64)
+    similarities = np.empty(n_pairs, dtype=np.float32)
+    
+    for i in prange(n_centers):
+        position = offsets[i]
+        for j in range(i + 1, n_centers):
+            similarity = np.float32(0.0)
+            for d in range(dim):
+                similarity += centers[i, d] * centers[j, d]
+            if similarity >= threshold:
+                rows[position] = i
+                cols[position] = j
+                similarities[position] = similarity
+                position += 1
+    
+    return rows, cols, similarities
+
+
+# No fastmath: both passes must make identical threshold decisions
+if NUMBA_AVAILABLE:
+    _count_pairs_above = njit(cache=True, parallel=True)(_count_pairs_above)
+    _collect_pairs_above = njit(cache=True, parallel=True)(_collect_pairs_above)
+
+
+def _group_by_label(labels: np.ndarray, ids: List[str]) -> Dict[int, List[str]]:
+    """
+    IDs grouped by label, in label order, keeping their order within a group.
+    
+    One stable argsort and a bincount of the labels give each group's slice
+    of the sorted IDs.
+    """
+    if len(labels) == 0:
+        return {}
+    
+    offset = int(labels.min())
+    order = np.argsort(labels, kind='stable')
+    counts = np.bincount(labels - offset)
+    ends = np.cumsum(counts).tolist()
+    sorted_ids = [ids[i] for i in order.tolist()]
+    
+    groups = {}
+    start = 0
+    for label, end in enumerate(ends, start=offset):
+        if end > start:
+            groups[label] = sorted_ids[start:end]
+        start = end
+    return groups
+
+
+def _sampled_silhouette_score(embeddings: np.ndarray, labels: np.ndarray,
+                              sample_size: Optional[int] = None) -> float:
+    """
+    Silhouette score, estimated on a fixed random sample of at most
+    sample_size documents (all documents if None)
+    """
+    if sample_size is not None and sample_size >= len(embeddings):
+        sample_size = None
+    return silhouette_score(embeddings, labels, metric='euclidean',
+                            sample_size=sample_size, random_state=42)
+
+
+def _score_clustering(embeddings: np.ndarray, labels: np.ndarray,
+                      sample_size: Optional[int] = None) -> Tuple[Optional[float], Optional[str]]:
+    """Silhouette score of a clustering (None for a single cluster), and error message"""
+    try:
+        # Workers run side by side, so keep each to one BLAS/OpenMP thread
+        with threadpool_limits(limits=1):
+            if len(np.unique(labels)) > 1:
+                return float(_sampled_silhouette_score(embeddings, labels, sample_size)), None
+            return None, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _fit_and_score_agglomerative(embeddings: np.ndarray, n_clusters: int,
+                                 sample_size: Optional[int] = None,
+                                 connectivity=None) -> Tuple[Optional[float], Optional[str]]:
+    """Fit agglomerative clustering with n_clusters and score it like _score_clustering"""
+    try:
+        with threadpool_limits(limits=1):
+            agg = AgglomerativeClustering(n_clusters=n_clusters, connectivity=connectivity)
+            labels = agg.fit_predict(embeddings)
+    except Exception as e:
+        return None, str(e)
+    
+    return _score_clustering(embeddings, labels, sample_size)
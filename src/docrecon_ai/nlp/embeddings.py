@@ -7,9 +7,13 @@ for semantic similarity analysis and document clustering.
 
 import os
 import pickle
+import queue
+import threading
+import time
 import numpy as np
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Iterable
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,6 +40,12 @@ try:
 except ImportError:
     TORCH_AVAILABLE = False
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
 
 class EmbeddingGenerator:
     """
@@ -61,13 +71,35 @@ class EmbeddingGenerator:
         self.model_name = getattr(config.nlp, 'model', 'sentence-transformers/all-MiniLM-L6-v2') if config else 'sentence-transformers/all-MiniLM-L6-v2'
         self.batch_size = getattr(config.nlp, 'batch_size', 32) if config else 32
         self.max_text_length = getattr(config.nlp, 'max_text_length', 10000) if config else 10000
+        self.backend = getattr(config.nlp, 'embedding_backend', 'torch') if config else 'torch'
+        
+        # Similarity index storage: float16 halves the index memory for large
+        # corpora, rows are converted back to float32 block by block while scoring
+        self.index_dtype = np.dtype(getattr(config.nlp, 'index_precision', 'float32') if config else 'float32')
+        self.index_block_size = 4096
         
         # Cache settings
         self.cache_dir = getattr(config, 'cache_dir', '~/.docrecon_cache') if config else '~/.docrecon_cache'
         self.cache_dir = Path(self.cache_dir).expanduser()
         self.cache_dir.mkdir(exist_ok=True)
         
-        # Model and vectorizer
+        # Embedding cache (content-based document ID -> vector), loaded from
+        # disk per model on first use. New embeddings are written back by
+        # save_embedding_cache, after each generate_embeddings call unless
+        # the caller saves once at the end of its run instead
+        self._embedding_cache = None
+        self._unsaved_embedding_ids = []
+        self._embedding_cache_stale = False  # cached rows dropped, next save rewrites the cache
+        self._next_cache_segment = 0
+        self._cache_delta_segments = 0
+        self.max_cache_segments = 16  # Delta segments before the cache is rewritten as one
+        
+        # Index of the last dict searched by find_similar_documents:
+        # (dict, ids, vectors, index)
+        self._similarity_index_cache = None
+        
+        # Model and vectorizer; calls into them are serialised by _model_lock
+        self._model_lock = threading.RLock()
         self.model = None
         self.vectorizer = None
         self.embedding_dim = None
@@ -103,17 +135,17 @@ class EmbeddingGenerator:
             model_cache_path = self.cache_dir / "models" / self.model_name.replace('/', '_')
             
             if model_cache_path.exists():
-                self.model = SentenceTransformer(str(model_cache_path))
+                self.model = self._load_sentence_transformer(str(model_cache_path))
                 self.logger.info("Loaded model from cache")
             else:
-                self.model = SentenceTransformer(self.model_name)
+                self.model = self._load_sentence_transformer(self.model_name)
                 
                 # Cache the model
                 model_cache_path.parent.mkdir(parents=True, exist_ok=True)
                 self.model.save(str(model_cache_path))
                 self.logger.info("Model cached for future use")
             
-            # Get embedding dimension
+            # Get embedding dimension (also warms up the inference backend)
             test_embedding = self.model.encode(["test"])
             self.embedding_dim = test_embedding.shape[1]
             self.method = "sentence_transformer"
@@ -128,6 +160,18 @@ class EmbeddingGenerator:
             else:
                 raise
     
+    def _load_sentence_transformer(self, model_name_or_path: str) -> 'SentenceTransformer':
+        """Load a Sentence Transformer with the configured inference backend"""
+        if self.backend != 'torch':
+            # ONNX Runtime / OpenVINO run an optimised, fused inference graph
+            # (sentence-transformers >= 3.2 exports it on first load)
+            try:
+                return SentenceTransformer(model_name_or_path, backend=self.backend)
+            except Exception as e:
+                self.logger.warning(f"Embedding backend '{self.backend}' not available, using torch: {e}")
+        
+        return SentenceTransformer(model_name_or_path)
+    
     def _initialize_tfidf(self):
         """Initialize TF-IDF vectorizer as fallback"""
         try:
@@ -150,13 +194,16 @@ class EmbeddingGenerator:
             self.logger.error(f"Failed to initialize TF-IDF vectorizer: {e}")
             raise
     
-    def generate_embeddings(self, texts: List[str], document_ids: List[str] = None) -> Dict[str, np.ndarray]:
+    def generate_embeddings(self, texts: List[str], document_ids: List[str] = None,
+                            save_cache: bool = True) -> Dict[str, np.ndarray]:
         """
         Generate embeddings for a list of texts.
         
         Args:
             texts: List of text content to embed
             document_ids: Optional list of document IDs for caching
+            save_cache: Write new embeddings to the disk cache now; if False,
+                the caller writes them later with save_embedding_cache()
             
         Returns:
             dict: Mapping of document IDs to embedding vectors
@@ -186,54 +233,78 @@ class EmbeddingGenerator:
         
         # Generate embeddings for uncached texts
         if texts_to_process:
-            if self.method == "sentence_transformer":
-                new_embeddings = self._generate_sentence_transformer_embeddings(texts_to_process)
-            elif self.method == "tfidf":
-                new_embeddings = self._generate_tfidf_embeddings(texts_to_process)
-            else:
-                raise ValueError(f"Unknown embedding method: {self.method}")
+            new_embeddings = self.embed_texts(texts_to_process)
             
             # Store new embeddings
             for doc_id, embedding in zip(ids_to_process, new_embeddings):
                 embeddings[doc_id] = embedding
                 self._cache_embedding(doc_id, embedding)
                 self.embeddings_generated += 1
+            
+            if save_cache:
+                self.save_embedding_cache()
         
         return embeddings
     
-    def _generate_sentence_transformer_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+    def fit(self, texts: Iterable[str]):
+        """
+        Fit the embedding model on a corpus if it needs fitting (TF-IDF) and
+        has not been fitted yet; texts may be a stream and are read once.
+        
+        Args:
+            texts: Iterable of text content to fit on
+        """
+        with self._model_lock:
+            if self.method == "tfidf" and not hasattr(self.vectorizer, 'vocabulary_'):
+                self.logger.info("Fitting TF-IDF vectorizer")
+                self.vectorizer.fit(texts)
+                self.embedding_dim = len(self.vectorizer.vocabulary_)
+    
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts without using the document embedding cache.
+        
+        For transient texts such as search queries, which have no stable
+        document ID to cache under.
+        
+        Args:
+            texts: List of text content to embed
+            
+        Returns:
+            np.ndarray: Embedding matrix of shape (N, dim)
+        """
+        # Query embeddings are computed on the QueryEmbeddingBatcher thread
+        # while documents may be embedded (and TF-IDF fitted) on another
+        with self._model_lock:
+            if self.method == "sentence_transformer":
+                return self._generate_sentence_transformer_embeddings(texts)
+            elif self.method == "tfidf":
+                return self._generate_tfidf_embeddings(texts)
+            else:
+                raise ValueError(f"Unknown embedding method: {self.method}")
+    
+    def _generate_sentence_transformer_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using Sentence Transformer"""
         # Truncate texts if needed
-        processed_texts = []
-        for text in texts:
-            if len(text) > self.max_text_length:
-                text = text[:self.max_text_length]
-            processed_texts.append(text)
-        
-        # Generate embeddings in batches
-        embeddings = []
-        for i in range(0, len(processed_texts), self.batch_size):
-            batch = processed_texts[i:i + self.batch_size]
-            batch_embeddings = self.model.encode(batch, convert_to_numpy=True)
-            embeddings.extend(batch_embeddings)
+        processed_texts = [text[:self.max_text_length] for text in texts]
         
-        return embeddings
+        # One encode call over all texts: the model sorts them by length and
+        # pads each batch_size batch only to its longest text, returning a
+        # single (N, dim) matrix
+        return self.model.encode(
+            processed_texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
     
-    def _generate_tfidf_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+    def _generate_tfidf_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using TF-IDF"""
         # Fit vectorizer if not already fitted
-        if not hasattr(self.vectorizer, 'vocabulary_'):
-            self.logger.info("Fitting TF-IDF vectorizer")
-            self.vectorizer.fit(texts)
-            self.embedding_dim = len(self.vectorizer.vocabulary_)
+        self.fit(texts)
         
-        # Transform texts to vectors
-        vectors = self.vectorizer.transform(texts)
-        
-        # Convert to dense numpy arrays
-        embeddings = [vector.toarray().flatten() for vector in vectors]
-        
-        return embeddings
+        # Transform texts to one dense (N, dim) matrix
+        return self.vectorizer.transform(texts).toarray()
     
     def calculate_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
@@ -277,61 +348,312 @@ class EmbeddingGenerator:
         Returns:
             list: List of (document_id, similarity_score) tuples
         """
-        similarities = []
+        doc_ids, index = self._get_similarity_index(document_embeddings)
+        return self.search_similarity_index(query_embedding, doc_ids, index, threshold, top_k)
+    
+    def _get_similarity_index(self, document_embeddings: Dict[str, np.ndarray]) -> Tuple[List[str], Any]:
+        """
+        Similarity index of document_embeddings, reused while the same dict is
+        searched again; it is rebuilt if the dict's IDs or vector objects have
+        changed since (e.g. embeddings were added).
+        """
+        doc_ids = list(document_embeddings.keys())
+        vectors = list(document_embeddings.values())
+        
+        cached = self._similarity_index_cache
+        if (cached is not None and cached[0] is document_embeddings and cached[1] == doc_ids
+                and all(a is b for a, b in zip(cached[2], vectors))):
+            return doc_ids, cached[3]
         
-        for doc_id, doc_embedding in document_embeddings.items():
-            similarity = self.calculate_similarity(query_embedding, doc_embedding)
-            if similarity >= threshold:
-                similarities.append((doc_id, similarity))
+        doc_ids, index = self.build_similarity_index(document_embeddings)
+        self._similarity_index_cache = (document_embeddings, doc_ids, vectors, index)
+        return doc_ids, index
+    
+    def build_similarity_index(self, document_embeddings: Dict[str, np.ndarray]) -> Tuple[List[str], Any]:
+        """
+        Build a similarity search index over document embeddings.
         
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Rows are L2-normalised, so inner product equals cosine similarity.
+        With faiss installed (and float32 precision) they are added to an
+        exact faiss.IndexFlatIP; otherwise they are stacked into a matrix
+        stored with index_dtype (nlp.index_precision, float32 by default).
         
-        # Limit results if requested
-        if top_k is not None:
-            similarities = similarities[:top_k]
+        Args:
+            document_embeddings: Dictionary of document embeddings
+            
+        Returns:
+            tuple: (document IDs, faiss index or matrix of shape (N, dim))
+        """
+        doc_ids = list(document_embeddings.keys())
+        if not doc_ids:
+            return doc_ids, np.empty((0, self.embedding_dim or 0), dtype=self.index_dtype)
         
-        return similarities
+        matrix = np.stack([np.asarray(document_embeddings[doc_id]).ravel() for doc_id in doc_ids])
+        return doc_ids, self.build_similarity_index_from_matrix(matrix)
     
-    def _get_cached_embedding(self, document_id: str) -> Optional[np.ndarray]:
-        """Get cached embedding for a document"""
-        cache_file = self.cache_dir / "embeddings" / f"{document_id}.pkl"
+    def build_similarity_index_from_matrix(self, embedding_matrix: np.ndarray, normalized: bool = False) -> Any:
+        """
+        Build a similarity search index from an already stacked embedding matrix.
         
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'rb') as f:
-                    embedding_data = pickle.load(f)
-                
-                # Check if embedding is compatible with current model
-                if (embedding_data.get('method') == self.method and
-                    embedding_data.get('model_name') == self.model_name):
-                    return embedding_data['embedding']
-                    
-            except Exception as e:
-                self.logger.warning(f"Failed to load cached embedding for {document_id}: {e}")
+        Args:
+            embedding_matrix: Embedding vectors, one row per document
+            normalized: Whether the rows are already L2-normalised
+            
+        Returns:
+            faiss index or normalised matrix, rows in embedding_matrix order
+        """
+        if len(embedding_matrix) == 0:
+            return np.empty((0, self.embedding_dim or 0), dtype=self.index_dtype)
+        
+        matrix = np.asarray(embedding_matrix, dtype=np.float32)
+        if not normalized:
+            matrix = self._normalize_rows(matrix)
+        
+        if FAISS_AVAILABLE and self.index_dtype == np.float32:
+            index = faiss.IndexFlatIP(matrix.shape[1])
+            index.add(np.ascontiguousarray(matrix))
+            return index
         
-        return None
+        return matrix.astype(self.index_dtype)
     
-    def _cache_embedding(self, document_id: str, embedding: np.ndarray):
-        """Cache an embedding for future use"""
+    def search_similarity_index(self, query_embedding: np.ndarray, doc_ids: List[str], index: Any,
+                                threshold: float = 0.8, top_k: int = None) -> List[Tuple[str, float]]:
+        """
+        Find the documents in a similarity index most similar to a query embedding.
+        
+        Args:
+            query_embedding: Query embedding vector
+            doc_ids: Document ID of each index row
+            index: Index from build_similarity_index()
+            threshold: Minimum similarity threshold
+            top_k: Maximum number of results to return
+            
+        Returns:
+            list: List of (document_id, similarity_score) tuples, most similar first
+        """
+        if not doc_ids or top_k == 0:
+            return []
+        
+        query = self._normalize_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        
+        if not isinstance(index, np.ndarray):
+            k = len(doc_ids) if top_k is None else min(top_k, len(doc_ids))
+            scores, rows = index.search(query.reshape(1, -1), k)
+            return [
+                (doc_ids[row], float(score))
+                for score, row in zip(scores[0], rows[0])
+                if row >= 0 and score >= threshold
+            ]
+        
+        # Score in float32 blocks small enough to stay in cache
+        scores = np.empty(len(doc_ids), dtype=np.float32)
+        for start in range(0, len(doc_ids), self.index_block_size):
+            block = index[start:start + self.index_block_size]
+            scores[start:start + len(block)] = block.astype(np.float32, copy=False) @ query
+        
+        candidates = np.flatnonzero(scores >= threshold)
+        
+        # Only the top_k best candidates need sorting
+        if top_k is not None and top_k < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            candidates.sort()
+        
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(doc_ids[i], float(scores[i])) for i in order]
+    
+    def normalize_embeddings(self, embeddings: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        L2-normalise embeddings, so that cosine similarity becomes a dot product.
+        
+        Args:
+            embeddings: Embedding vector per document ID
+            
+        Returns:
+            dict: float32 unit vector per document ID (all-zero vectors stay zero)
+        """
+        if not embeddings:
+            return {}
+        
+        doc_ids = list(embeddings.keys())
+        matrix = self._normalize_rows(np.stack([
+            np.asarray(embeddings[doc_id], dtype=np.float32).ravel() for doc_id in doc_ids
+        ]))
+        return dict(zip(doc_ids, matrix))
+    
+    def _normalize_rows(self, matrix: np.ndarray) -> np.ndarray:
+        """L2-normalise matrix rows (all-zero rows stay zero)"""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def _get_cache_dir(self) -> Path:
+        """Directory of the embedding cache for the current method and model"""
+        model_key = self.model_name.replace('/', '_')
+        return self.cache_dir / "embeddings" / f"{self.method}_{model_key}"
+    
+    def _load_embedding_cache(self) -> Dict[str, np.ndarray]:
+        """
+        Load the embedding cache into memory (once).
+        
+        The cache is a series of segments, each an ids/vectors .npy pair
+        written once and never modified: a "full" segment holds the whole
+        cache as of when it was written, "delta" segments after it hold only
+        the embeddings added since. Segments older than the newest full one
+        are obsolete and removed here, before any of them is mapped.
+        """
+        if self._embedding_cache is None:
+            self._embedding_cache = {}
+            cache_dir = self._get_cache_dir()
+            segments = self._list_cache_segments(cache_dir)
+            self._next_cache_segment = max((number for number, _ in segments), default=-1) + 1
+            
+            full_numbers = [number for number, kind in segments if kind == 'full']
+            base = max(full_numbers, default=-1)
+            self._remove_cache_segments(cache_dir, segments, before=base)
+            
+            loaded = []
+            for number, kind in segments:
+                if number < base or (number > base and kind != 'delta'):
+                    continue
+                try:
+                    # Vectors are memory-mapped: cached rows are read from disk
+                    # only when used, and processes share the page cache
+                    ids = np.load(cache_dir / f"{kind}_{number:06d}.ids.npy", allow_pickle=False).tolist()
+                    vectors = np.load(cache_dir / f"{kind}_{number:06d}.vectors.npy", mmap_mode='r')
+                    if len(ids) == len(vectors):
+                        loaded.append((ids, vectors))
+                    else:
+                        self.logger.warning(f"Ignoring inconsistent embedding cache segment {number} in {cache_dir}")
+                except Exception as e:
+                    self.logger.warning(f"Failed to load embedding cache segment {number} in {cache_dir}: {e}")
+            
+            # Later segments override earlier ones; all rows share the newest
+            # segment's shape (a full segment is written when it changes)
+            row_shape = loaded[-1][1].shape[1:] if loaded else None
+            for ids, vectors in loaded:
+                if vectors.shape[1:] == row_shape:
+                    self._embedding_cache.update(zip(ids, vectors))
+            self._cache_delta_segments = sum(1 for number, kind in segments if number > base and kind == 'delta')
+        
+        return self._embedding_cache
+    
+    def save_embedding_cache(self):
+        """
+        Write embeddings added since the last save to the disk cache.
+        
+        Only the new embeddings are written, as a new delta segment; existing
+        segment files are never rewritten, so other processes (and this one)
+        can keep them memory-mapped. The whole cache is written as a new full
+        segment instead after max_cache_segments deltas, or when the
+        embedding dimension changed, and the older segments are removed.
+        """
+        if not self._unsaved_embedding_ids:
+            return
+        
         try:
-            cache_dir = self.cache_dir / "embeddings"
+            cache_dir = self._get_cache_dir()
             cache_dir.mkdir(parents=True, exist_ok=True)
             
-            cache_file = cache_dir / f"{document_id}.pkl"
+            write_full = self._embedding_cache_stale or self._cache_delta_segments >= self.max_cache_segments
+            if write_full:
+                ids = list(self._embedding_cache.keys())
+            else:
+                ids = list(dict.fromkeys(self._unsaved_embedding_ids))
             
-            embedding_data = {
-                'embedding': embedding,
-                'method': self.method,
-                'model_name': self.model_name,
-                'embedding_dim': self.embedding_dim,
-            }
+            kind = 'full' if write_full else 'delta'
+            number = self._claim_cache_segment(cache_dir)
+            prefix = cache_dir / f"{kind}_{number:06d}"
+            
+            # Vectors are copied row by row into a memory-mapped file rather
+            # than stacked into one in-memory matrix first. The ids file is
+            # written last (renamed into place), so a segment without one is
+            # incomplete and ignored
+            first = np.asarray(self._embedding_cache[ids[0]])
+            matrix = np.lib.format.open_memmap(f"{prefix}.vectors.npy", mode='w+', dtype=first.dtype,
+                                               shape=(len(ids),) + first.shape)
+            for i, doc_id in enumerate(ids):
+                matrix[i] = self._embedding_cache[doc_id]
+            matrix.flush()
+            del matrix
+            
+            tmp_ids_file = Path(f"{prefix}.ids.npy.tmp")
+            with open(tmp_ids_file, 'wb') as f:
+                np.save(f, np.array(ids), allow_pickle=False)
+            os.replace(tmp_ids_file, f"{prefix}.ids.npy")
+            
+            self._next_cache_segment = number + 1
+            self._unsaved_embedding_ids = []
+            if write_full:
+                self._embedding_cache_stale = False
+                self._cache_delta_segments = 0
+                self._remove_cache_segments(cache_dir, self._list_cache_segments(cache_dir), before=number)
+            else:
+                self._cache_delta_segments += 1
             
-            with open(cache_file, 'wb') as f:
-                pickle.dump(embedding_data, f)
-                
         except Exception as e:
-            self.logger.warning(f"Failed to cache embedding for {document_id}: {e}")
+            self.logger.warning(f"Failed to save embedding cache: {e}")
+    
+    def _claim_cache_segment(self, cache_dir: Path) -> int:
+        """
+        Reserve the next segment number in cache_dir.
+        
+        Numbers are claimed by creating a marker file with O_EXCL, so
+        processes sharing the cache never write the same segment, and new
+        numbers always follow the newest claimed one.
+        """
+        claimed = [int(marker.name[len("segment_"):-len(".claim")])
+                   for marker in cache_dir.glob("segment_*.claim")
+                   if marker.name[len("segment_"):-len(".claim")].isdigit()]
+        number = max([self._next_cache_segment] + [n + 1 for n in claimed])
+        while True:
+            try:
+                os.close(os.open(cache_dir / f"segment_{number:06d}.claim", os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return number
+            except FileExistsError:
+                number += 1
+    
+    def _list_cache_segments(self, cache_dir: Path) -> List[Tuple[int, str]]:
+        """(number, kind) of the complete segments in cache_dir, oldest first"""
+        segments = []
+        if cache_dir.is_dir():
+            for ids_file in cache_dir.glob("*_*.ids.npy"):
+                kind, _, number = ids_file.name[:-len(".ids.npy")].partition('_')
+                if kind in ('full', 'delta') and number.isdigit():
+                    segments.append((int(number), kind))
+        return sorted(segments)
+    
+    def _remove_cache_segments(self, cache_dir: Path, segments: List[Tuple[int, str]], before: int):
+        """Delete the files of segments numbered below before, where possible"""
+        for number, kind in segments:
+            if number >= before:
+                continue
+            for filename in (f"{kind}_{number:06d}.ids.npy", f"{kind}_{number:06d}.vectors.npy",
+                             f"segment_{number:06d}.claim"):
+                try:
+                    (cache_dir / filename).unlink(missing_ok=True)
+                except OSError as e:
+                    # Still memory-mapped on Windows; removed by a later load
+                    self.logger.debug(f"Could not remove obsolete embedding cache segment {number}: {e}")
+    
+    def _get_cached_embedding(self, document_id: str) -> Optional[np.ndarray]:
+        """Get cached embedding for a document"""
+        embedding = self._load_embedding_cache().get(document_id)
+        # Plain ndarray view of the (possibly memory-mapped) cached row
+        return np.asarray(embedding) if embedding is not None else None
+    
+    def _cache_embedding(self, document_id: str, embedding: np.ndarray):
+        """Cache an embedding for future use"""
+        cache = self._load_embedding_cache()
+        
+        # All cached vectors share one matrix; a different dimension means
+        # the cached ones are stale (e.g. a refitted TF-IDF vocabulary)
+        if cache and next(iter(cache.values())).shape != np.shape(embedding):
+            cache.clear()
+            self._unsaved_embedding_ids = []
+            self._embedding_cache_stale = True
+        
+        cache[document_id] = np.asarray(embedding)
+        self._unsaved_embedding_ids.append(document_id)
     
     def get_embedding_info(self) -> Dict[str, Any]:
         """
@@ -368,12 +690,18 @@ class EmbeddingGenerator:
     def clear_cache(self):
         """Clear embedding cache"""
         try:
+            # Drop our maps of the cache files first, so they can be deleted on Windows
+            self._embedding_cache = None
+            self._similarity_index_cache = None
+            
             cache_dir = self.cache_dir / "embeddings"
             if cache_dir.exists():
                 import shutil
                 shutil.rmtree(cache_dir)
                 cache_dir.mkdir(parents=True, exist_ok=True)
-                self.logger.info("Embedding cache cleared")
+            self._unsaved_embedding_ids = []
+            self._embedding_cache_stale = False
+            self.logger.info("Embedding cache cleared")
         except Exception as e:
             self.logger.error(f"Failed to clear embedding cache: {e}")
     
@@ -428,3 +756,91 @@ class EmbeddingGenerator:
             self.logger.error(f"Failed to load embeddings from {filepath}: {e}")
             return {}
 
+
+class QueryEmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into batches.
+    
+    Requests from any thread are queued; one worker thread takes up to
+    max_batch of them, waiting at most max_delay seconds for more to
+    arrive, embeds them with a single call and resolves each request's
+    Future with its row.
+    """
+    
+    def __init__(self, embed_fn: Callable[[List[str]], np.ndarray],
+                 max_batch: int = 32, max_delay: float = 0.005):
+        """
+        Initialize the batcher.
+        
+        Args:
+            embed_fn: Function embedding a list of texts into an (N, dim) matrix
+            max_batch: Maximum number of texts per embedding call
+            max_delay: Seconds to wait for further requests after the first
+        """
+        self.embed_fn = embed_fn
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+    
+    def embed_async(self, text: str) -> Future:
+        """
+        Queue a text for embedding.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Future: Resolves to the text's embedding vector
+        """
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future
+    
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a text, batched with concurrent requests, and wait for the result"""
+        return self.embed_async(text).result()
+    
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        if self._worker is not None:
+            return
+        
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="query-embedding-batcher", daemon=True
+                )
+                self._worker.start()
+    
+    def _run(self):
+        """Collect and embed batches of queued requests until the process exits"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Skip requests whose callers cancelled them meanwhile
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            
+            try:
+                embeddings = self.embed_fn([text for text, _ in batch])
+            except Exception as e:
+                self.logger.error(f"Error embedding batch of {len(batch)} queries: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
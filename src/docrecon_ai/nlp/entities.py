@@ -6,6 +6,7 @@ to provide semantic metadata and improve searchability.
 """
 
 import re
+import threading
 from collections import Counter
 from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
@@ -70,10 +71,11 @@ class EntityExtractor:
         self.lemmatizer = None
         self.stop_words = set()
         
-        # Statistics
+        # Statistics (guarded by a lock, texts may be processed by several threads)
         self.texts_processed = 0
         self.entities_extracted = 0
         self.keywords_extracted = 0
+        self._statistics_lock = threading.Lock()
         
         # Initialize models
         self._initialize_models()
@@ -132,8 +134,15 @@ class EntityExtractor:
                     except Exception:
                         pass
             
-            # Initialize lemmatizer
+            # Initialize lemmatizer. WordNet is loaded lazily on first use and
+            # that load is not thread-safe, so it is forced here, before the
+            # analyzer calls this extractor from several threads
             self.lemmatizer = WordNetLemmatizer()
+            try:
+                self.lemmatizer.lemmatize('test')
+            except LookupError as e:
+                self.logger.warning(f"WordNet not available, keywords are not lemmatized: {e}")
+                self.lemmatizer = None
             
             # Load stop words
             try:
@@ -188,7 +197,8 @@ class EntityExtractor:
                     entities = {}
                 
                 result['entities'] = entities
-                self.entities_extracted += len(entities)
+                with self._statistics_lock:
+                    self.entities_extracted += len(entities)
             
             # Extract keywords
             if self.enable_keywords:
@@ -197,7 +207,8 @@ class EntityExtractor:
                 
                 result['keywords'] = keywords
                 result['key_phrases'] = key_phrases
-                self.keywords_extracted += len(keywords)
+                with self._statistics_lock:
+                    self.keywords_extracted += len(keywords)
             
             # Calculate statistics
             if self.nltk_initialized:
@@ -207,7 +218,8 @@ class EntityExtractor:
                 except Exception:
                     pass
             
-            self.texts_processed += 1
+            with self._statistics_lock:
+                self.texts_processed += 1
             
         except Exception as e:
             self.logger.error(f"Error extracting entities and keywords: {e}")
@@ -0,0 +1,132 @@
+"""
+Disk-backed storage for extracted document texts
+
+Keeps extracted texts in one append-only temporary file instead of as
+Python strings in memory; only the (offset, length) of each text is held
+in RAM and texts are read back on access.
+"""
+
+import os
+import tempfile
+import threading
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TextStore(MutableMapping):
+    """
+    Dictionary of document ID to text, backed by a temporary file.
+    
+    Texts are UTF-8 encoded and appended to the file; reading a text is a
+    single positioned read. Replacing or deleting a text does not reclaim
+    its space in the file until the store is closed.
+    """
+    
+    def __init__(self, directory: str = None):
+        """
+        Initialize the text store.
+        
+        Args:
+            directory: Directory for the temporary file (system default if None)
+        """
+        self._file = tempfile.TemporaryFile(dir=directory, buffering=0)
+        self._fd = self._file.fileno()
+        self._size = 0
+        self._index: Dict[str, Tuple[int, int, int]] = {}  # doc_id -> (offset, byte length, text length)
+        self._lock = threading.Lock()
+        
+        # Texts are read back in passes over the whole file
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(self._fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError as e:
+                logger.debug(f"posix_fadvise not supported for text store: {e}")
+    
+    def __setitem__(self, doc_id: str, text: str):
+        data = text.encode('utf-8', errors='surrogatepass')
+        with self._lock:
+            offset = self._size
+            if hasattr(os, 'pwrite'):
+                written = 0
+                while written < len(data):
+                    written += os.pwrite(self._fd, data[written:], offset + written)
+            else:
+                self._file.seek(offset)
+                self._file.write(data)
+            self._size += len(data)
+            self._index[doc_id] = (offset, len(data), len(text))
+    
+    def __getitem__(self, doc_id: str) -> str:
+        offset, byte_length, _ = self._index[doc_id]
+        return self._read(offset, byte_length).decode('utf-8', errors='surrogatepass')
+    
+    def __delitem__(self, doc_id: str):
+        del self._index[doc_id]
+    
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self._index
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def text_length(self, doc_id: str) -> int:
+        """Length of a stored text in characters (0 if missing), without reading it"""
+        entry = self._index.get(doc_id)
+        return entry[2] if entry else 0
+    
+    def read_prefix(self, doc_id: str, max_chars: int) -> str:
+        """
+        Read the first max_chars characters of a stored text.
+        
+        Only the bytes that can hold them are read (at most 4 per
+        character), not the whole text.
+        
+        Args:
+            doc_id: Document ID
+            max_chars: Number of characters to return
+        
+        Returns:
+            str: Start of the text ('' if missing)
+        """
+        entry = self._index.get(doc_id)
+        if not entry:
+            return ''
+        
+        offset, byte_length, _ = entry
+        data = self._read(offset, min(byte_length, 4 * max_chars))
+        if len(data) < byte_length:
+            data = data[:_complete_utf8_length(data)]
+        return data.decode('utf-8', errors='surrogatepass')[:max_chars]
+    
+    def _read(self, offset: int, length: int) -> bytes:
+        """Read length bytes at offset from the backing file"""
+        if hasattr(os, 'pread'):
+            return os.pread(self._fd, length, offset)
+        
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+    
+    def close(self):
+        """Close and remove the backing file"""
+        self._index = {}
+        self._file.close()
+
+
+def _complete_utf8_length(data: bytes) -> int:
+    """Length of data without a UTF-8 sequence cut off at its end"""
+    start = len(data) - 1
+    while start > 0 and (data[start] & 0xC0) == 0x80:
+        start -= 1
+    if start < 0:
+        return 0
+    
+    lead = data[start]
+    sequence_length = 4 if lead >= 0xF0 else 3 if lead >= 0xE0 else 2 if lead >= 0xC0 else 1
+    return start if start + sequence_length > len(data) else len(data)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the embedding cache
+"""
+
+import pytest
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.docrecon_ai.nlp.embeddings import EmbeddingGenerator
+
+
+@pytest.fixture
+def make_generator(temp_dir, monkeypatch):
+    """Create embedding generators sharing one cache directory"""
+    pytest.importorskip("sklearn")
+    # The cache does not depend on the model; avoid loading one
+    monkeypatch.setattr(EmbeddingGenerator, '_initialize_model', EmbeddingGenerator._initialize_tfidf)
+    config = SimpleNamespace(cache_dir=temp_dir, nlp=SimpleNamespace())
+    return lambda: EmbeddingGenerator(config)
+
+
+def _vector(value, dim=4):
+    return np.full(dim, value, dtype=np.float32)
+
+
+class TestEmbeddingCache:
+    """Test cases for the segmented on-disk embedding cache"""
+    
+    def test_delta_segments_reload(self, make_generator):
+        """Test that each save appends a segment and a new generator reloads all of them"""
+        generator = make_generator()
+        for i in range(3):
+            generator._cache_embedding(f'doc{i}', _vector(i))
+            generator.save_embedding_cache()
+        
+        files = os.listdir(generator._get_cache_dir())
+        assert sum(name.startswith('delta_') and name.endswith('.ids.npy') for name in files) == 3
+        
+        cache = make_generator()._load_embedding_cache()
+        assert sorted(cache) == ['doc0', 'doc1', 'doc2']
+        for i in range(3):
+            np.testing.assert_array_equal(cache[f'doc{i}'], _vector(i))
+    
+    def test_full_rewrite_replaces_segments(self, make_generator):
+        """Test that max_cache_segments deltas are followed by one full segment"""
+        generator = make_generator()
+        generator.max_cache_segments = 2
+        for i in range(3):
+            generator._cache_embedding(f'doc{i}', _vector(i))
+            generator.save_embedding_cache()
+        
+        ids_files = [name for name in os.listdir(generator._get_cache_dir()) if name.endswith('.ids.npy')]
+        assert len(ids_files) == 1
+        assert ids_files[0].startswith('full_')
+        
+        cache = make_generator()._load_embedding_cache()
+        assert sorted(cache) == ['doc0', 'doc1', 'doc2']
+        np.testing.assert_array_equal(cache['doc2'], _vector(2))
+    
+    def test_later_segments_override_earlier(self, make_generator):
+        """Test that a re-saved document gets its newest vector on reload"""
+        generator = make_generator()
+        generator._cache_embedding('doc', _vector(1))
+        generator.save_embedding_cache()
+        generator._cache_embedding('doc', _vector(2))
+        generator.save_embedding_cache()
+        
+        np.testing.assert_array_equal(make_generator()._load_embedding_cache()['doc'], _vector(2))
+    
+    def test_dimension_change_rewrites_cache(self, make_generator):
+        """Test that vectors of a new dimension replace the whole cache"""
+        generator = make_generator()
+        generator._cache_embedding('old', _vector(1))
+        generator.save_embedding_cache()
+        
+        generator = make_generator()
+        generator._cache_embedding('new', _vector(1, dim=8))
+        generator.save_embedding_cache()
+        
+        cache = make_generator()._load_embedding_cache()
+        assert list(cache) == ['new']
+        assert cache['new'].shape == (8,)
+    
+    def test_generators_sharing_cache_write_separate_segments(self, make_generator):
+        """Test that two runs loaded from the same cache do not overwrite each other's segment"""
+        first, second = make_generator(), make_generator()
+        first._load_embedding_cache()
+        second._load_embedding_cache()
+        
+        first._cache_embedding('a', _vector(1))
+        second._cache_embedding('b', _vector(2))
+        first.save_embedding_cache()
+        second.save_embedding_cache()
+        
+        cache = make_generator()._load_embedding_cache()
+        np.testing.assert_array_equal(cache['a'], _vector(1))
+        np.testing.assert_array_equal(cache['b'], _vector(2))
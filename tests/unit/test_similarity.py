@@ -0,0 +1,105 @@
+"""
+Unit tests for semantic similarity grouping
+"""
+
+import pytest
+from datetime import datetime
+
+import numpy as np
+
+from src.docrecon_ai.crawler.base import DocumentInfo
+from src.docrecon_ai.detection.similarity import SimilarityAnalyzer
+
+DBSCAN = pytest.importorskip("sklearn.cluster").DBSCAN
+
+
+@pytest.fixture
+def similarity_fixture():
+    """Documents and embeddings forming a few tight clusters, a chain and noise"""
+    rng = np.random.RandomState(7)
+    dim = 32
+    vectors = []
+    
+    # Tight clusters around random centers
+    for size in (2, 3, 5):
+        center = rng.randn(dim)
+        for _ in range(size):
+            vectors.append(center + 0.02 * rng.randn(dim))
+    
+    # A chain: neighbours are similar (0.986-0.996), the ends are not
+    start, end = rng.randn(dim), rng.randn(dim)
+    for step in np.linspace(0.0, 1.0, 12):
+        vectors.append((1 - step) * start + step * end)
+    
+    # Unrelated documents
+    for _ in range(10):
+        vectors.append(rng.randn(dim))
+    
+    documents = [
+        DocumentInfo(path=f"/docs/doc{i}.txt", filename=f"doc{i}.txt", size=1000 + i,
+                     modified_date=datetime(2024, 1, 1))
+        for i in range(len(vectors))
+    ]
+    embeddings = {f"doc{i}_{1000 + i}": vector for i, vector in enumerate(vectors)}
+    return documents, embeddings
+
+
+def _dbscan_groups(embeddings, threshold):
+    """Groups found by DBSCAN on a dense precomputed cosine distance matrix"""
+    doc_ids = list(embeddings)
+    matrix = np.array([embeddings[doc_id] for doc_id in doc_ids])
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    distances = np.clip(1 - matrix @ matrix.T, 0, None)
+    
+    labels = DBSCAN(eps=1 - threshold, min_samples=2, metric='precomputed').fit_predict(distances)
+    
+    groups = {}
+    for doc_id, label in zip(doc_ids, labels):
+        if label != -1:
+            groups.setdefault(label, set()).add(doc_id)
+    return {frozenset(group) for group in groups.values()}
+
+
+def _analyzer_groups(analyzer, documents, embeddings):
+    results = analyzer.find_similar_documents(documents, embeddings)
+    return {frozenset(group['document_ids']) for group in results['similarity_groups']}
+
+
+class TestSimilarityGroups:
+    """Test cases for similarity group detection"""
+    
+    @pytest.mark.parametrize('threshold', [0.8, 0.9, 0.95, 0.988, 0.99])
+    def test_graph_propagation_matches_dbscan(self, similarity_fixture, threshold):
+        """Test that label propagation over the sparse graph gives DBSCAN's groups"""
+        documents, embeddings = similarity_fixture
+        analyzer = SimilarityAnalyzer()
+        analyzer.similarity_threshold = threshold
+        analyzer.block_size = 8  # Several row blocks
+        
+        expected = _dbscan_groups(embeddings, threshold)
+        assert expected
+        assert _analyzer_groups(analyzer, documents, embeddings) == expected
+    
+    @pytest.mark.parametrize('threshold', [0.8, 0.9, 0.95, 0.988, 0.99])
+    def test_ball_tree_matches_dbscan(self, similarity_fixture, threshold):
+        """Test that the ball-tree path for large corpora gives DBSCAN's groups"""
+        documents, embeddings = similarity_fixture
+        analyzer = SimilarityAnalyzer()
+        analyzer.similarity_threshold = threshold
+        analyzer.tree_search_threshold = 0  # Always use the ball tree
+        
+        assert _analyzer_groups(analyzer, documents, embeddings) == _dbscan_groups(embeddings, threshold)
+    
+    def test_sparse_matrix_holds_only_pairs_above_threshold(self, similarity_fixture):
+        """Test that the thresholded matrix stores exactly the pairs at or above the threshold"""
+        _, embeddings = similarity_fixture
+        analyzer = SimilarityAnalyzer()
+        analyzer.block_size = 8
+        _, matrix = analyzer._build_embedding_matrix(embeddings)
+        
+        sparse = analyzer._calculate_similarity_matrix(matrix)
+        dense = matrix @ matrix.T
+        
+        np.testing.assert_array_equal(sparse.toarray() != 0, dense >= analyzer.similarity_threshold)
+        np.testing.assert_allclose(sparse.toarray()[dense >= analyzer.similarity_threshold],
+                                   dense[dense >= analyzer.similarity_threshold], rtol=1e-5)
@@ -0,0 +1,96 @@
+"""
+Unit tests for the disk-backed text store
+"""
+
+import pytest
+
+from src.docrecon_ai.nlp.text_store import TextStore, _complete_utf8_length
+
+
+@pytest.fixture
+def text_store(temp_dir):
+    """Create a text store in the test directory"""
+    store = TextStore(temp_dir)
+    yield store
+    store.close()
+
+
+class TestTextStore:
+    """Test cases for TextStore class"""
+    
+    def test_round_trip(self, text_store):
+        """Test that stored texts are read back unchanged"""
+        texts = {
+            'ascii': 'Hello world',
+            'umlauts': 'Größenänderung der Übersicht',
+            'emoji': 'Report \U0001F4C4 final ✅',
+            'empty': '',
+        }
+        for doc_id, text in texts.items():
+            text_store[doc_id] = text
+        
+        assert len(text_store) == len(texts)
+        assert set(text_store) == set(texts)
+        for doc_id, text in texts.items():
+            assert doc_id in text_store
+            assert text_store[doc_id] == text
+            assert text_store.text_length(doc_id) == len(text)
+    
+    def test_overwrite(self, text_store):
+        """Test that replacing a text returns the new one"""
+        text_store['doc'] = 'first version of the text'
+        text_store['other'] = 'unrelated'
+        text_store['doc'] = 'second'
+        
+        assert text_store['doc'] == 'second'
+        assert text_store.text_length('doc') == len('second')
+        assert text_store['other'] == 'unrelated'
+        assert len(text_store) == 2
+    
+    def test_delete(self, text_store):
+        """Test that deleted texts are gone and others remain"""
+        text_store['a'] = 'alpha'
+        text_store['b'] = 'beta'
+        del text_store['a']
+        
+        assert 'a' not in text_store
+        assert list(text_store) == ['b']
+        assert text_store['b'] == 'beta'
+        assert text_store.text_length('a') == 0
+        assert text_store.read_prefix('a', 10) == ''
+        with pytest.raises(KeyError):
+            text_store['a']
+        with pytest.raises(KeyError):
+            del text_store['a']
+    
+    def test_read_prefix(self, text_store):
+        """Test reading the first characters of a text"""
+        text_store['doc'] = 'abcdefghij'
+        
+        assert text_store.read_prefix('doc', 3) == 'abc'
+        assert text_store.read_prefix('doc', 10) == 'abcdefghij'
+        assert text_store.read_prefix('doc', 50) == 'abcdefghij'
+    
+    @pytest.mark.parametrize('text', [
+        'ä' * 40,                        # 2-byte characters
+        '€' * 40,                        # 3-byte characters
+        '\U0001F600' * 40,               # 4-byte characters
+        'a€b\U0001F600cä' * 10,          # mixed widths
+    ])
+    def test_read_prefix_multibyte(self, text_store, text):
+        """Test that prefixes cut inside multibyte text are whole characters"""
+        text_store['doc'] = text
+        
+        for max_chars in range(1, len(text) + 2):
+            assert text_store.read_prefix('doc', max_chars) == text[:max_chars]
+    
+    def test_complete_utf8_length(self):
+        """Test trimming a UTF-8 sequence cut off at the end of the data"""
+        data = 'a€'.encode('utf-8')  # b'a\xe2\x82\xac'
+        
+        assert _complete_utf8_length(data) == 4
+        assert _complete_utf8_length(data[:3]) == 1
+        assert _complete_utf8_length(data[:2]) == 1
+        assert _complete_utf8_length(data[:1]) == 1
+        assert _complete_utf8_length('\U0001F600'.encode('utf-8')[:3]) == 0
+        assert _complete_utf8_length(b'') == 0
@@ -0,0 +1,94 @@
+"""
+Unit tests for version detection
+"""
+
+import pytest
+import random
+from datetime import datetime
+
+from src.docrecon_ai.crawler.base import DocumentInfo
+from src.docrecon_ai.detection.versioning import VersionDetector
+
+rapidfuzz = pytest.importorskip("rapidfuzz")
+from rapidfuzz import fuzz
+
+
+def _make_documents(filenames):
+    """Create one DocumentInfo per filename, with distinct paths"""
+    return [
+        DocumentInfo(path=f"/docs/{i}/{filename}", filename=filename, size=1000 + i,
+                     modified_date=datetime(2024, 1, 1))
+        for i, filename in enumerate(filenames)
+    ]
+
+
+def _brute_force_groups(documents, threshold):
+    """Connected components of all pairs whose fuzz.ratio reaches the threshold"""
+    stems = [doc.filename.rsplit('.', 1)[0].lower() for doc in documents]
+    parent = list(range(len(documents)))
+    
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+    
+    for i in range(len(stems)):
+        for j in range(i + 1, len(stems)):
+            if fuzz.ratio(stems[i], stems[j]) >= threshold * 100:
+                parent[find(j)] = find(i)
+    
+    components = {}
+    for i, doc in enumerate(documents):
+        components.setdefault(find(i), set()).add(doc.path)
+    return {frozenset(paths) for paths in components.values() if len(paths) > 1}
+
+
+def _fuzzy_groups(detector, documents):
+    groups = detector._find_fuzzy_filename_matches(documents)
+    return {frozenset(doc['path'] for doc in group['documents']) for group in groups}
+
+
+class TestFuzzyFilenameMatching:
+    """Test cases for fuzzy filename grouping"""
+    
+    @pytest.mark.parametrize('threshold', [0.5, 0.6, 0.75, 0.8, 0.9])
+    def test_matches_brute_force(self, threshold):
+        """Test that blocked, length-prefiltered grouping equals brute-force pairing"""
+        rng = random.Random(42)
+        filenames = []
+        for _ in range(120):
+            stem = ''.join(rng.choice('abcde') for _ in range(rng.randint(1, 12)))
+            filenames.append(f"{stem}.{rng.choice(['docx', 'pdf', 'txt'])}")
+        documents = _make_documents(filenames)
+        
+        detector = VersionDetector()
+        detector.filename_similarity_threshold = threshold
+        detector.block_size = 16  # Several blocks, each with its own candidate columns
+        
+        assert _fuzzy_groups(detector, documents) == _brute_force_groups(documents, threshold)
+    
+    @pytest.mark.parametrize('filenames, threshold', [
+        # ratio exactly 80.0
+        (['abcde.docx', 'abcdx.docx'], 0.8),
+        # ratio 2/3: float32 scores round below the float64 threshold, and the
+        # lengths sit exactly on the length prefilter bound (4 = 2 * (2 - T) / T)
+        (['ab.docx', 'abcd.docx'], 2 / 3),
+        (['Report.docx', 'Report_final_v2.docx', 'unrelated.txt'], 0.5),
+    ])
+    def test_threshold_boundary(self, filenames, threshold):
+        """Test grouping of pairs scoring exactly or just above the threshold"""
+        documents = _make_documents(filenames)
+        detector = VersionDetector()
+        detector.filename_similarity_threshold = threshold
+        
+        expected = _brute_force_groups(documents, threshold)
+        assert expected
+        assert _fuzzy_groups(detector, documents) == expected
+    
+    def test_just_below_threshold_not_grouped(self):
+        """Test that a pair scoring just below the threshold stays ungrouped"""
+        documents = _make_documents(['abcde.docx', 'abcdx.docx'])
+        detector = VersionDetector()
+        detector.filename_similarity_threshold = 0.8 + 1e-9
+        
+        assert _fuzzy_groups(detector, documents) == set()